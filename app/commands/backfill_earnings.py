@@ -0,0 +1,17 @@
+import asyncio
+
+from core.settings import settings
+from infrastructure.postgres_repository import LavkaPostgresRepository
+from infrastructure.roster_cache import RosterCache
+
+
+async def main():
+    repository = LavkaPostgresRepository(
+        config=settings.storage_url, roster_cache=RosterCache()
+    )
+    rows = await repository.rebuild_earnings_rollup()
+    print(f"Rebuilt courier_daily_earnings: {rows} rows")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -12,6 +12,44 @@ RATING_COEFFICIENTS = {
     CourierType.FOOT: 3,
 }
 
+MAX_ASSIGN_BATCH_DAYS = 31
+
+SLOT_TEMPLATES_CACHE_SIZE = 1024
+
+BULK_INSERT_THRESHOLD = 1000
+
+META_INFO_CHUNK_SIZE = 1000
+
+ENGINE_PROFILES = {
+    "dev": {
+        "echo": True,
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_timeout": 30,
+        "pool_recycle": -1,
+        "pool_pre_ping": False,
+        "statement_cache_size": 100,
+    },
+    "prod": {
+        "echo": False,
+        "pool_size": 10,
+        "max_overflow": 5,
+        "pool_timeout": 10,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+        "statement_cache_size": 500,
+    },
+    "bench": {
+        "echo": False,
+        "pool_size": 20,
+        "max_overflow": 0,
+        "pool_timeout": 30,
+        "pool_recycle": -1,
+        "pool_pre_ping": False,
+        "statement_cache_size": 500,
+    },
+}
+
 COURIER_SETTINGS = {
     CourierType.FOOT: {
         "max_weight": 10,
@@ -1,6 +1,13 @@
+from contextlib import nullcontext
+
 from dependency_injector import containers, providers
 
+from infrastructure.entities import engine
+from infrastructure.executors import init_assignment_executor
+from infrastructure.memory_repository import LavkaMemoryRepository
 from infrastructure.postgres_repository import LavkaPostgresRepository
+from infrastructure.roster_cache import RosterCache
+from infrastructure.unit_of_work import UnitOfWork
 from services.use_cases.courier_service import CourierService
 from services.use_cases.order_service import OrderService
 
@@ -9,10 +16,37 @@ class Container(containers.DeclarativeContainer):
     wiring_config = containers.WiringConfiguration(packages=["endpoints"])
     config = providers.Configuration()
 
-    repository = providers.Singleton(
-        LavkaPostgresRepository,
-        config=config.storage_url,
+    db_engine = providers.Object(engine)
+    roster_cache = providers.Singleton(RosterCache)
+
+    unit_of_work = providers.Selector(
+        config.storage,
+        postgres=providers.Factory(UnitOfWork, engine=db_engine),
+        memory=providers.Factory(nullcontext),
+    )
+
+    repository = providers.Selector(
+        config.storage,
+        postgres=providers.Singleton(
+            LavkaPostgresRepository,
+            config=config.storage_url,
+            roster_cache=roster_cache,
+        ),
+        memory=providers.Singleton(LavkaMemoryRepository),
+    )
+
+    assignment_executor = providers.Resource(
+        init_assignment_executor,
+        max_workers=config.assignment_workers,
     )
 
     courier_service = providers.Factory(CourierService, repository=repository)
-    order_service = providers.Factory(OrderService, repository=repository)
+    order_service = providers.Factory(
+        OrderService,
+        repository=repository,
+        assignment_engine=config.assignment_engine,
+        assignment_time_budget=config.assignment_time_budget,
+        assignment_executor=assignment_executor,
+        assignment_workers=config.assignment_workers,
+        assignment_stream_chunk_size=config.assignment_stream_chunk_size,
+    )
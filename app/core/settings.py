@@ -1,11 +1,26 @@
+from typing import Optional
+
 from pydantic import BaseSettings, Field
 
 
 class Settings(BaseSettings):
     project_name: str = Field(..., env="PROJECT_NAME")
     storage_url: str
+    storage: str = "postgres"
+    db_profile: str = "dev"
+    db_echo: Optional[bool] = None
+    db_pool_size: Optional[int] = None
+    db_max_overflow: Optional[int] = None
+    db_pool_timeout: Optional[float] = None
+    db_pool_recycle: Optional[int] = None
+    db_pool_pre_ping: Optional[bool] = None
+    db_statement_cache_size: Optional[int] = None
     limit: int = 10
     time_window: int = 1
+    assignment_engine: str = "greedy"
+    assignment_time_budget: float = 1
+    assignment_workers: int = 0
+    assignment_stream_chunk_size: int = 5000
 
     class Config:
         env_file = ".env"
@@ -4,14 +4,15 @@ from http import HTTPStatus
 from dependency_injector.wiring import inject, Provide
 from fastapi import APIRouter, Depends, Request
 from pydantic import ValidationError
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, StreamingResponse
 
 from core.containers import Container
 from infrastructure.rate_limiter import rate_limiter
-from models import CouriersList
+from infrastructure.unit_of_work import unit_of_work
+from models import CouriersList, CouriersMetaInfoRequest
 from services.use_cases.courier_service import CourierService
 
-router = APIRouter()
+router = APIRouter(dependencies=[Depends(unit_of_work)])
 
 
 @router.get("/couriers/assignments", dependencies=[Depends(rate_limiter)])
@@ -102,6 +103,7 @@ async def get_courier(
 async def get_couriers(
     offset=0,
     limit=1,
+    cursor=None,
     courier_service: CourierService = Depends(
         Provide[Container.courier_service]
     ),
@@ -114,6 +116,10 @@ async def get_couriers(
                 content={"detail": "Invalid data provided."},
                 status_code=HTTPStatus.BAD_REQUEST,
             )
+        if cursor is not None:
+            return await courier_service.get_couriers_page(
+                cursor=cursor, limit=correct_limit
+            )
     except ValueError:
         return JSONResponse(
             content={"detail": "Invalid data provided."},
@@ -159,3 +165,40 @@ async def get_courier_meta_info(
         if result is None
         else result
     )
+
+
+@router.post("/couriers/meta-info", dependencies=[Depends(rate_limiter)])
+@inject
+async def get_couriers_meta_info(
+    request: Request,
+    courier_service: CourierService = Depends(
+        Provide[Container.courier_service]
+    ),
+):
+    body = await request.json()
+    try:
+        meta_info_request = CouriersMetaInfoRequest.parse_obj(body)
+    except ValidationError:
+        return JSONResponse(
+            content={"detail": "Invalid data provided."},
+            status_code=HTTPStatus.BAD_REQUEST,
+        )
+
+    meta_infos = courier_service.get_couriers_meta_info(
+        courier_ids=None
+        if meta_info_request.courier_ids == "all"
+        else meta_info_request.courier_ids,
+        start_date=datetime.combine(
+            meta_info_request.start_date, datetime.min.time()
+        ),
+        end_date=datetime.combine(
+            meta_info_request.end_date, datetime.min.time()
+        ),
+    )
+    return StreamingResponse(
+        (
+            f"{meta_info.json(by_alias=True)}\n"
+            async for meta_info in meta_infos
+        ),
+        media_type="application/x-ndjson",
+    )
@@ -6,12 +6,14 @@ from fastapi import APIRouter, Depends, Request
 from pydantic import ValidationError
 from starlette.responses import JSONResponse
 
+from core.constants import MAX_ASSIGN_BATCH_DAYS
 from core.containers import Container
 from infrastructure.rate_limiter import rate_limiter
+from infrastructure.unit_of_work import unit_of_work
 from models import CompleteOrderList, OrdersList
 from services.use_cases.order_service import OrderService
 
-router = APIRouter()
+router = APIRouter(dependencies=[Depends(unit_of_work)])
 
 
 @router.post("/orders", dependencies=[Depends(rate_limiter)])
@@ -61,6 +63,7 @@ async def get_order(
 async def get_orders(
     offset=0,
     limit=1,
+    cursor=None,
     order_service: OrderService = Depends(Provide[Container.order_service]),
 ):
     try:
@@ -77,6 +80,17 @@ async def get_orders(
             content={"detail": "Invalid data provided."},
             status_code=HTTPStatus.BAD_REQUEST,
         )
+
+    if cursor is not None:
+        try:
+            return await order_service.get_orders_page(
+                cursor=cursor, limit=correct_limit
+            )
+        except ValueError:
+            return JSONResponse(
+                content={"detail": "Invalid data provided."},
+                status_code=HTTPStatus.BAD_REQUEST,
+            )
     return await order_service.get_orders(offset=offset, limit=limit)
 
 
@@ -111,6 +125,7 @@ async def complete_orders(
 @inject
 async def assign_orders(
     date=None,
+    incremental: bool = False,
     order_service: OrderService = Depends(Provide[Container.order_service]),
 ):
     if date is None:
@@ -127,7 +142,108 @@ async def assign_orders(
                 status_code=HTTPStatus.BAD_REQUEST,
             )
 
-    result = await order_service.assign_orders(date=correct_date)
+    result = await order_service.assign_orders(
+        date=correct_date, incremental=incremental
+    )
+    return (
+        JSONResponse(
+            content={"detail": "Invalid data provided."},
+            status_code=HTTPStatus.BAD_REQUEST,
+        )
+        if result is None
+        else JSONResponse(
+            content=result.dict(), status_code=HTTPStatus.CREATED
+        )
+    )
+
+
+@router.post("/orders/assign/batch", dependencies=[Depends(rate_limiter)])
+@inject
+async def assign_orders_batch(
+    start_date,
+    end_date,
+    order_service: OrderService = Depends(Provide[Container.order_service]),
+):
+    try:
+        correct_start_date = datetime.datetime.strptime(start_date, "%Y-%m-%d")
+        correct_end_date = datetime.datetime.strptime(end_date, "%Y-%m-%d")
+    except ValueError:
+        return JSONResponse(
+            content={"detail": "Invalid data provided."},
+            status_code=HTTPStatus.BAD_REQUEST,
+        )
+
+    days = (correct_end_date - correct_start_date).days + 1
+    if days < 1 or days > MAX_ASSIGN_BATCH_DAYS:
+        return JSONResponse(
+            content={"detail": "Invalid data provided."},
+            status_code=HTTPStatus.BAD_REQUEST,
+        )
+
+    result = await order_service.assign_orders_batch(
+        start_date=correct_start_date, end_date=correct_end_date
+    )
+    return (
+        JSONResponse(
+            content={"detail": "Invalid data provided."},
+            status_code=HTTPStatus.BAD_REQUEST,
+        )
+        if result is None
+        else JSONResponse(
+            content=[summary.dict() for summary in result],
+            status_code=HTTPStatus.CREATED,
+        )
+    )
+
+
+@router.post("/orders/assign/stream", dependencies=[Depends(rate_limiter)])
+@inject
+async def assign_orders_stream(
+    date=None,
+    order_service: OrderService = Depends(Provide[Container.order_service]),
+):
+    if date is None:
+        correct_date = datetime.datetime.now()
+    else:
+        try:
+            correct_date = datetime.datetime.strptime(date, "%Y-%m-%d")
+        except ValueError:
+            return JSONResponse(
+                content={"detail": "Invalid data provided."},
+                status_code=HTTPStatus.BAD_REQUEST,
+            )
+
+    result = await order_service.assign_orders_stream(date=correct_date)
+    return (
+        JSONResponse(
+            content={"detail": "Invalid data provided."},
+            status_code=HTTPStatus.BAD_REQUEST,
+        )
+        if result is None
+        else JSONResponse(
+            content=result.dict(), status_code=HTTPStatus.CREATED
+        )
+    )
+
+
+@router.post("/orders/assign/replan", dependencies=[Depends(rate_limiter)])
+@inject
+async def replan_orders(
+    date=None,
+    order_service: OrderService = Depends(Provide[Container.order_service]),
+):
+    if date is None:
+        correct_date = datetime.datetime.now()
+    else:
+        try:
+            correct_date = datetime.datetime.strptime(date, "%Y-%m-%d")
+        except ValueError:
+            return JSONResponse(
+                content={"detail": "Invalid data provided."},
+                status_code=HTTPStatus.BAD_REQUEST,
+            )
+
+    result = await order_service.replan_orders(date=correct_date)
     return (
         JSONResponse(
             content={"detail": "Invalid data provided."},
@@ -0,0 +1,25 @@
+from dependency_injector.wiring import inject, Provide
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from core.containers import Container
+from infrastructure.rate_limiter import rate_limiter
+from infrastructure.roster_cache import RosterCache
+
+router = APIRouter()
+
+
+@router.get("/stats/roster-cache", dependencies=[Depends(rate_limiter)])
+@inject
+async def get_roster_cache_stats(
+    roster_cache: RosterCache = Depends(Provide[Container.roster_cache]),
+):
+    return roster_cache.get_stats()
+
+
+@router.get("/stats/pool", dependencies=[Depends(rate_limiter)])
+@inject
+async def get_pool_stats(
+    db_engine: AsyncEngine = Depends(Provide[Container.db_engine]),
+):
+    return db_engine.pool.get_stats()
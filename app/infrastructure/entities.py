@@ -1,20 +1,46 @@
 from sqlalchemy import (
     ARRAY,
     Column,
+    Date,
     DateTime,
     Enum,
     Float,
     ForeignKey,
     func,
+    Index,
     Integer,
     String,
+    text,
 )
 from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 
-from core.settings import settings
+from core.constants import ENGINE_PROFILES
+from core.settings import settings, Settings
+from infrastructure.pool import InstrumentedQueuePool
 
-engine = create_async_engine(settings.storage_url, echo=True)
+
+def get_engine_options(settings: Settings) -> dict:
+    options = {
+        key: value
+        if getattr(settings, f"db_{key}") is None
+        else getattr(settings, f"db_{key}")
+        for key, value in ENGINE_PROFILES[settings.db_profile].items()
+    }
+    statement_cache_size = options.pop("statement_cache_size")
+    return {
+        **options,
+        "poolclass": InstrumentedQueuePool,
+        "connect_args": {
+            "statement_cache_size": statement_cache_size,
+            "prepared_statement_cache_size": statement_cache_size,
+        },
+    }
+
+
+engine = create_async_engine(
+    settings.storage_url, **get_engine_options(settings)
+)
 Base = declarative_base()
 metadata = Base.metadata
 
@@ -42,6 +68,21 @@ class Order(Base):
     completed_time = Column(DateTime, nullable=True)
     created_at = Column(DateTime, nullable=False, default=func.now())
 
+    __table_args__ = (
+        Index(
+            "ix_orders_unassigned_created_at",
+            "created_at",
+            postgresql_where=text("courier_id IS NULL"),
+        ),
+        Index(
+            "ix_orders_courier_id_completed_time",
+            "courier_id",
+            "completed_time",
+            postgresql_include=["cost"],
+            postgresql_where=text("courier_id IS NOT NULL"),
+        ),
+    )
+
 
 class OrderDeliverySchedule(Base):
     __tablename__ = "orders_delivery_schedule"
@@ -51,6 +92,33 @@ class OrderDeliverySchedule(Base):
     courier_id = Column(Integer, ForeignKey("couriers.id"), nullable=False)
     order_id = Column(Integer, ForeignKey("orders.id"), nullable=False)
     group_order_id = Column(Integer, nullable=False)
+    # First order of the slot, which tells apart slots of one courier that
+    # start at the same time.
+    lead_order_id = Column(Integer, nullable=True)
     group_time = Column(DateTime, nullable=True)
     group_weight = Column(Float, nullable=False)
     group_cost = Column(Float, nullable=False)
+
+    __table_args__ = (
+        Index("ix_orders_delivery_schedule_date", "date"),
+        Index(
+            "ix_orders_delivery_schedule_courier_id_date", "courier_id", "date"
+        ),
+        Index("ix_orders_delivery_schedule_order_id", "order_id"),
+    )
+
+
+class CourierDailyEarnings(Base):
+    __tablename__ = "courier_daily_earnings"
+
+    courier_id = Column(Integer, ForeignKey("couriers.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    cost_sum = Column(Float, nullable=False)
+    order_count = Column(Integer, nullable=False)
+
+
+class RosterVersion(Base):
+    __tablename__ = "roster_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False)
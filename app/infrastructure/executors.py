@@ -0,0 +1,13 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, Optional
+
+
+def init_assignment_executor(
+    max_workers: int,
+) -> Iterator[Optional[ProcessPoolExecutor]]:
+    if max_workers <= 0:
+        yield None
+        return
+    executor = ProcessPoolExecutor(max_workers=max_workers)
+    yield executor
+    executor.shutdown(wait=True)
@@ -0,0 +1,483 @@
+import bisect
+import itertools
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta
+from typing import AsyncIterator, Iterable, Optional
+
+from models import (
+    CompleteOrderList,
+    CourierModel,
+    CourierScheduleModel,
+    CouriersList,
+    CouriersListResponse,
+    DeliveryScheduleModel,
+    GroupOrderModel,
+    OrderModel,
+    OrdersList,
+    TimeSlot,
+)
+from services.use_cases.abstract_repositories import LavkaAbstractRepository
+
+
+class LavkaMemoryRepository(LavkaAbstractRepository):
+    def __init__(self):
+        self.couriers: dict[int, dict] = {}
+        self.orders: dict[int, dict] = {}
+        # Ids only grow, so appending keeps these sorted for keyset pages.
+        self.sorted_courier_ids: list[int] = []
+        self.sorted_order_ids: list[int] = []
+        self.orders_by_created_at: list[tuple[datetime, int]] = []
+        self.completed_orders: dict[int, list[tuple[datetime, int]]] = {}
+        self.schedule: dict[date, list[dict]] = {}
+        self.scheduled_orders: dict[int, dict] = {}
+        self.courier_ids = itertools.count(1)
+        self.order_ids = itertools.count(1)
+
+    async def create_couriers(
+        self, *, couriers_model: CouriersList
+    ) -> CouriersList:
+        created_couriers = []
+        for courier_model in couriers_model.couriers:
+            courier = courier_model.dict(exclude={"id"})
+            courier["id"] = next(self.courier_ids)
+            self.couriers[courier["id"]] = courier
+            self.sorted_courier_ids.append(courier["id"])
+            created_couriers.append(self.get_courier_model(courier))
+        return CouriersList(couriers=created_couriers)
+
+    async def get_courier(self, *, courier_id: int) -> Optional[CourierModel]:
+        courier = self.couriers.get(courier_id)
+        return None if courier is None else self.get_courier_model(courier)
+
+    async def get_couriers(
+        self, offset: int, limit: int
+    ) -> CouriersListResponse:
+        couriers = itertools.islice(
+            self.couriers.values(), offset, offset + limit
+        )
+        return CouriersListResponse(
+            couriers=[self.get_courier_model(courier) for courier in couriers],
+            limit=limit,
+            offset=offset,
+        )
+
+    async def get_couriers_after(
+        self, after_id: int, limit: int
+    ) -> list[CourierModel]:
+        start = bisect.bisect_right(self.sorted_courier_ids, after_id)
+        return [
+            self.get_courier_model(self.couriers[courier_id])
+            for courier_id in self.sorted_courier_ids[start : start + limit]
+        ]
+
+    async def get_all_couriers(self) -> list[CourierModel]:
+        return [
+            self.get_courier_model(courier)
+            for courier in self.couriers.values()
+        ]
+
+    async def create_orders(
+        self, *, orders_model: OrdersList
+    ) -> list[OrderModel]:
+        created_at = datetime.now()
+        created_orders = []
+        for order_model in orders_model.orders:
+            order = order_model.dict(exclude={"id"})
+            order["id"] = next(self.order_ids)
+            order["courier_id"] = None
+            order["created_at"] = created_at
+            self.orders[order["id"]] = order
+            self.sorted_order_ids.append(order["id"])
+            bisect.insort(self.orders_by_created_at, (created_at, order["id"]))
+            created_orders.append(self.get_order_model(order))
+        return created_orders
+
+    async def get_order(self, *, order_id: int) -> Optional[OrderModel]:
+        order = self.orders.get(order_id)
+        return None if order is None else self.get_order_model(order)
+
+    async def get_orders(self, *, offset: int, limit: int) -> list[OrderModel]:
+        orders = itertools.islice(self.orders.values(), offset, offset + limit)
+        return [self.get_order_model(order) for order in orders]
+
+    async def get_orders_after(
+        self, after_id: int, limit: int
+    ) -> list[OrderModel]:
+        start = bisect.bisect_right(self.sorted_order_ids, after_id)
+        return [
+            self.get_order_model(self.orders[order_id])
+            for order_id in self.sorted_order_ids[start : start + limit]
+        ]
+
+    async def complete_orders(
+        self, *, complete_orders_model: CompleteOrderList
+    ):
+        complete_info = complete_orders_model.complete_info
+        order_ids = list(
+            dict.fromkeys(info.order_id for info in complete_info)
+        )
+        completions = self.get_completions(
+            complete_info=complete_info,
+            orders={
+                order_id: (
+                    self.orders[order_id]["courier_id"],
+                    self.orders[order_id]["completed_time"],
+                )
+                for order_id in order_ids
+                if order_id in self.orders
+            },
+            courier_ids={
+                info.courier_id
+                for info in complete_info
+                if info.courier_id in self.couriers
+            },
+        )
+        if completions is None:
+            return None
+
+        for order_id, (courier_id, completed_time) in completions.items():
+            order = self.orders[order_id]
+            order["courier_id"] = courier_id
+            order["completed_time"] = completed_time
+            bisect.insort(
+                self.completed_orders.setdefault(courier_id, []),
+                (completed_time, order_id),
+            )
+        return [
+            self.get_order_model(self.orders[order_id])
+            for order_id in order_ids
+        ]
+
+    async def get_cost_sum_and_order_count(
+        self, courier_id: int, start_date: datetime, end_date: datetime
+    ):
+        completed_orders = self.completed_orders.get(courier_id, [])
+        first = bisect.bisect_left(completed_orders, (start_date,))
+        last = bisect.bisect_left(completed_orders, (end_date,))
+        costs = [
+            self.orders[order_id]["cost"]
+            for _, order_id in completed_orders[first:last]
+        ]
+        return (sum(costs) if costs else None), len(costs)
+
+    async def get_cost_sums_and_order_counts(
+        self,
+        courier_ids: Optional[list[int]],
+        start_date: datetime,
+        end_date: datetime,
+    ) -> dict[int, tuple[float, int]]:
+        totals = {}
+        for courier_id in (
+            self.completed_orders if courier_ids is None else courier_ids
+        ):
+            cost_sum, order_count = await self.get_cost_sum_and_order_count(
+                courier_id=courier_id, start_date=start_date, end_date=end_date
+            )
+            if order_count:
+                totals[courier_id] = cost_sum, order_count
+        return totals
+
+    async def stream_couriers_totals(
+        self,
+        courier_ids: Optional[list[int]],
+        start_date: datetime,
+        end_date: datetime,
+        chunk_size: int,
+    ) -> AsyncIterator[list[tuple[CourierModel, Optional[float], int]]]:
+        couriers = sorted(
+            self.couriers.values()
+            if courier_ids is None
+            else (
+                self.couriers[courier_id]
+                for courier_id in set(courier_ids)
+                if courier_id in self.couriers
+            ),
+            key=lambda x: x["id"],
+        )
+        totals = await self.get_cost_sums_and_order_counts(
+            courier_ids=courier_ids, start_date=start_date, end_date=end_date
+        )
+        for chunk_start in range(0, len(couriers), chunk_size):
+            yield [
+                (
+                    self.get_courier_model(courier),
+                    *totals.get(courier["id"], (None, 0)),
+                )
+                for courier in couriers[chunk_start : chunk_start + chunk_size]
+            ]
+
+    async def get_orders_to_assign(self, date: datetime) -> list[OrderModel]:
+        start_of_day, end_of_day = self.get_days_range(
+            start_date=date, end_date=date
+        )
+        return [
+            self.get_order_model(order)
+            for order in self.get_created_orders(start_of_day, end_of_day)
+            if order["courier_id"] is None
+        ]
+
+    async def stream_orders_to_assign(
+        self, date: datetime, chunk_size: int
+    ) -> AsyncIterator[list[OrderModel]]:
+        start_of_day, end_of_day = self.get_days_range(
+            start_date=date, end_date=date
+        )
+        orders = sorted(
+            (
+                order
+                for order in self.get_created_orders(start_of_day, end_of_day)
+                if order["courier_id"] is None
+            ),
+            key=lambda x: (-x["weight"], x["id"]),
+        )
+        for chunk_start in range(0, len(orders), chunk_size):
+            yield [
+                self.get_order_model(order)
+                for order in orders[chunk_start : chunk_start + chunk_size]
+            ]
+
+    async def get_unscheduled_orders(self, date: datetime) -> list[OrderModel]:
+        start_of_day, end_of_day = self.get_days_range(
+            start_date=date, end_date=date
+        )
+        return [
+            self.get_order_model(order)
+            for order in self.get_created_orders(start_of_day, end_of_day)
+            if order["courier_id"] is None
+            and order["id"] not in self.scheduled_orders
+        ]
+
+    async def get_orders_to_assign_by_date(
+        self, start_date: datetime, end_date: datetime
+    ) -> dict[date, list[OrderModel]]:
+        start_of_range, end_of_range = self.get_days_range(
+            start_date=start_date, end_date=end_date
+        )
+        orders_by_date = {}
+        for order in self.get_created_orders(start_of_range, end_of_range):
+            if order["courier_id"] is None:
+                orders_by_date.setdefault(
+                    order["created_at"].date(), []
+                ).append(self.get_order_model(order))
+        return orders_by_date
+
+    def get_created_orders(
+        self, start_date: datetime, end_date: datetime
+    ) -> Iterable[dict]:
+        first = bisect.bisect_left(self.orders_by_created_at, (start_date,))
+        last = bisect.bisect_left(self.orders_by_created_at, (end_date,))
+        return (
+            self.orders[order_id]
+            for _, order_id in self.orders_by_created_at[first:last]
+        )
+
+    @staticmethod
+    def get_days_range(
+        start_date: datetime, end_date: datetime
+    ) -> tuple[datetime, datetime]:
+        start_of_range = start_date.replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        end_of_range = end_date.replace(
+            hour=0, minute=0, second=0, microsecond=0
+        ) + timedelta(days=1)
+        return start_of_range, end_of_range
+
+    @staticmethod
+    def get_schedule_records(time_slots: dict, date: datetime) -> list[dict]:
+        return [
+            {
+                "date": date,
+                "courier_id": courier,
+                "order_id": order,
+                "group_order_id": group_order_id,
+                "lead_order_id": schedule_record.order_ids[0],
+                "group_time": schedule_record.get_start_date(date),
+                "group_weight": schedule_record.weight,
+                "group_cost": schedule_record.cost,
+            }
+            for courier, value in time_slots.items()
+            for schedule_record in value
+            for group_order_id, order in enumerate(schedule_record.order_ids)
+        ]
+
+    def add_schedule_records(self, schedule_records: list[dict]) -> None:
+        for schedule_record in schedule_records:
+            self.schedule.setdefault(
+                schedule_record["date"].date(), []
+            ).append(schedule_record)
+            self.scheduled_orders[
+                schedule_record["order_id"]
+            ] = schedule_record
+
+    @asynccontextmanager
+    async def schedule_transaction(
+        self, date: datetime
+    ) -> AsyncIterator[None]:
+        yield
+
+    async def get_scheduled_slots(
+        self, date: datetime, completed_only: bool = False
+    ) -> dict[int, list[TimeSlot]]:
+        schedule_records = sorted(
+            (
+                record
+                for record in self.schedule.get(date.date(), [])
+                if not completed_only
+                or self.orders[record["order_id"]]["completed_time"]
+                is not None
+            ),
+            key=lambda x: (
+                x["courier_id"],
+                x["group_time"],
+                x["lead_order_id"],
+                x["group_order_id"],
+            ),
+        )
+        scheduled_slots = {}
+        for courier_id, courier_records in itertools.groupby(
+            schedule_records, key=lambda x: x["courier_id"]
+        ):
+            scheduled_slots[courier_id] = []
+            for (group_time, _), slot_records in itertools.groupby(
+                courier_records,
+                key=lambda x: (x["group_time"], x["lead_order_id"]),
+            ):
+                slot_records = list(slot_records)
+                scheduled_slots[courier_id].append(
+                    TimeSlot(
+                        start_minute=TimeSlot.get_start_minute(
+                            start_date=group_time, date=date
+                        ),
+                        order_ids=[
+                            record["order_id"] for record in slot_records
+                        ],
+                        weight=slot_records[0]["group_weight"],
+                        cost=slot_records[0]["group_cost"],
+                    )
+                )
+        return scheduled_slots
+
+    async def save_schedule_delta(
+        self, time_slots: dict, date: datetime, order_ids: Iterable[int]
+    ) -> None:
+        order_ids = set(order_ids)
+        schedule_records = []
+        for schedule_record in self.get_schedule_records(
+            time_slots=time_slots, date=date
+        ):
+            if schedule_record["order_id"] in order_ids:
+                schedule_records.append(schedule_record)
+                continue
+            record = self.scheduled_orders.get(schedule_record["order_id"])
+            if record is not None:
+                record["group_weight"] = schedule_record["group_weight"]
+                record["group_cost"] = schedule_record["group_cost"]
+        self.add_schedule_records(schedule_records)
+
+    async def save_schedules(self, schedules: dict[datetime, dict]) -> None:
+        for schedule_date, time_slots in schedules.items():
+            self.add_schedule_records(
+                self.get_schedule_records(
+                    time_slots=time_slots, date=schedule_date
+                )
+            )
+
+    async def save_schedule(self, time_slots: dict, date: datetime) -> None:
+        self.add_schedule_records(
+            self.get_schedule_records(time_slots=time_slots, date=date)
+        )
+
+    async def replace_schedule(self, time_slots: dict, date: datetime) -> None:
+        completed_records = []
+        for record in self.schedule.pop(date.date(), []):
+            if self.orders[record["order_id"]]["completed_time"] is not None:
+                completed_records.append(record)
+                continue
+            self.scheduled_orders.pop(record["order_id"], None)
+        self.add_schedule_records(completed_records)
+        completed_order_ids = {
+            record["order_id"] for record in completed_records
+        }
+        self.add_schedule_records(
+            [
+                record
+                for record in self.get_schedule_records(
+                    time_slots=time_slots, date=date
+                )
+                if record["order_id"] not in completed_order_ids
+            ]
+        )
+
+    async def get_count_of_schedule(self, date: datetime) -> int:
+        return len(self.schedule.get(date.date(), []))
+
+    async def get_scheduled_dates(
+        self, start_date: datetime, end_date: datetime
+    ) -> set[date]:
+        return {
+            schedule_date
+            for schedule_date, schedule_records in self.schedule.items()
+            if schedule_records
+            and start_date.date() <= schedule_date <= end_date.date()
+        }
+
+    async def release_connection(self) -> None:
+        pass
+
+    async def get_couriers_assignments(self, courier_id: int, date: datetime):
+        schedule_records = sorted(
+            (
+                record
+                for record in self.schedule.get(date.date(), [])
+                if courier_id < 0 or record["courier_id"] == courier_id
+            ),
+            key=lambda x: (x["courier_id"], x["group_order_id"]),
+        )
+        if not schedule_records:
+            return None
+
+        couriers = []
+        for schedule_courier_id, courier_records in itertools.groupby(
+            schedule_records, key=lambda x: x["courier_id"]
+        ):
+            groups = [
+                GroupOrderModel(
+                    group_order_id=group_order_id,
+                    orders=[
+                        self.get_order_model(self.orders[record["order_id"]])
+                        for record in group_records
+                    ],
+                )
+                for group_order_id, group_records in itertools.groupby(
+                    courier_records, key=lambda x: x["group_order_id"]
+                )
+            ]
+            couriers.append(
+                CourierScheduleModel(
+                    courier_id=schedule_courier_id, orders=groups
+                )
+            )
+        return DeliveryScheduleModel(
+            date=date.date().isoformat(), couriers=couriers
+        )
+
+    @staticmethod
+    def get_courier_model(courier: dict) -> CourierModel:
+        return CourierModel(
+            courier_id=courier["id"],
+            courier_type=courier["courier_type"],
+            regions=courier["regions"],
+            working_hours=courier["working_hours"],
+        )
+
+    @staticmethod
+    def get_order_model(order: dict) -> OrderModel:
+        return OrderModel(
+            order_id=order["id"],
+            weight=order["weight"],
+            regions=order["regions"],
+            delivery_hours=order["delivery_hours"],
+            cost=order["cost"],
+            completed_time=order["completed_time"],
+        )
@@ -0,0 +1,50 @@
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from models import PoolStats
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.checkout_wait = 0.0
+        self.max_checkout_wait = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.checkout_timeouts += 1
+            raise
+        finally:
+            wait = time.perf_counter() - start
+            self.checkouts += 1
+            self.checkout_wait += wait
+            self.max_checkout_wait = max(self.max_checkout_wait, wait)
+
+    def get_stats(self) -> PoolStats:
+        capacity = self.size() + self._max_overflow
+        checked_out = self.checkedout()
+        return PoolStats(
+            size=self.size(),
+            max_overflow=self._max_overflow,
+            checked_out=checked_out,
+            utilization=(
+                round(checked_out / capacity, 4)
+                if self._max_overflow >= 0 and capacity
+                else None
+            ),
+            checkouts=self.checkouts,
+            checkout_timeouts=self.checkout_timeouts,
+            avg_checkout_wait_ms=(
+                round(self.checkout_wait / self.checkouts * 1e3, 3)
+                if self.checkouts
+                else 0
+            ),
+            max_checkout_wait_ms=round(self.max_checkout_wait * 1e3, 3),
+        )
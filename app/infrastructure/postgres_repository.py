@@ -1,16 +1,41 @@
 import itertools
-from datetime import datetime, timedelta
-from typing import Optional
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta
+from typing import AsyncIterator, Collection, Iterable, Optional, Union
 
-from sqlalchemy import and_, func, null, select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import (
+    and_,
+    any_,
+    ARRAY,
+    bindparam,
+    column,
+    Date,
+    DateTime,
+    Float,
+    delete,
+    exists,
+    func,
+    insert,
+    Integer,
+    literal,
+    null,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
 
+from core.constants import BULK_INSERT_THRESHOLD
 from infrastructure.entities import (
     Courier,
-    engine,
+    CourierDailyEarnings,
     Order,
     OrderDeliverySchedule,
+    RosterVersion,
 )
+from infrastructure.roster_cache import RosterCache
+from infrastructure.unit_of_work import begin, get_bind, release, transaction
 from models import (
     CompleteOrderList,
     CourierModel,
@@ -21,21 +46,37 @@ from models import (
     GroupOrderModel,
     OrderModel,
     OrdersList,
+    TimeSlot,
 )
 from services.use_cases.abstract_repositories import LavkaAbstractRepository
 
+SCHEDULE_COLUMNS = (
+    "date",
+    "courier_id",
+    "order_id",
+    "group_order_id",
+    "lead_order_id",
+    "group_time",
+    "group_weight",
+    "group_cost",
+)
+
 
 class LavkaPostgresRepository(LavkaAbstractRepository):
-    def __init__(self, *, config: dict):
+    def __init__(self, *, config: dict, roster_cache: RosterCache):
         self.config = config
+        self.roster_cache = roster_cache
 
     async def create_couriers(
         self, *, couriers_model: CouriersList
     ) -> CouriersList:
+        if len(couriers_model.couriers) >= BULK_INSERT_THRESHOLD:
+            return await self.copy_couriers(couriers_model=couriers_model)
+
         couriers = [
             Courier(**courier.dict()) for courier in couriers_model.couriers
         ]
-        async with AsyncSession(engine) as session:
+        async with AsyncSession(await get_bind()) as session:
             async with session.begin():
                 session.add_all(couriers)
                 await session.flush()
@@ -52,25 +93,19 @@ class LavkaPostgresRepository(LavkaAbstractRepository):
         return CouriersList(couriers=created_couriers)
 
     async def get_courier(self, *, courier_id: int) -> Optional[CourierModel]:
-        async with AsyncSession(engine) as session:
-            stmt = select(Courier).where(Courier.id == courier_id)
-            result = await session.execute(stmt)
-            courier = result.scalar_one_or_none()
-
-            if courier is None:
-                return None
-
-            return CourierModel(
-                courier_id=courier.id,
-                courier_type=courier.courier_type,
-                regions=courier.regions,
-                working_hours=courier.working_hours,
-            )
+        async with AsyncSession(await get_bind()) as session:
+            async with session.begin():
+                version = await self.get_roster_version(session)
+                courier = self.roster_cache.get(courier_id, version=version)
+                if courier is None and self.roster_cache.version != version:
+                    await self.load_roster(session, version=version)
+                    courier = self.roster_cache.couriers.get(courier_id)
+                return courier
 
     async def get_couriers(
         self, offset: int, limit: int
     ) -> CouriersListResponse:
-        async with AsyncSession(engine) as session:
+        async with AsyncSession(await get_bind()) as session:
             async with session.begin():
                 stmt = select(Courier).offset(offset).limit(limit)
                 result = await session.execute(stmt)
@@ -88,13 +123,18 @@ class LavkaPostgresRepository(LavkaAbstractRepository):
                     couriers=couriers_models, limit=limit, offset=offset
                 )
 
-    @staticmethod
-    async def get_all_couriers() -> list[CourierModel]:
-        async with AsyncSession(engine) as session:
+    async def get_couriers_after(
+        self, after_id: int, limit: int
+    ) -> list[CourierModel]:
+        async with AsyncSession(await get_bind()) as session:
             async with session.begin():
-                stmt = select(Courier)
+                stmt = (
+                    select(Courier)
+                    .where(Courier.id > after_id)
+                    .order_by(Courier.id)
+                    .limit(limit)
+                )
                 result = await session.execute(stmt)
-                couriers = result.scalars().all()
                 return [
                     CourierModel(
                         courier_id=courier.id,
@@ -102,14 +142,105 @@ class LavkaPostgresRepository(LavkaAbstractRepository):
                         regions=courier.regions,
                         working_hours=courier.working_hours,
                     )
-                    for courier in couriers
+                    for courier in result.scalars().all()
                 ]
 
+    async def get_all_couriers(self) -> list[CourierModel]:
+        async with AsyncSession(await get_bind()) as session:
+            async with session.begin():
+                version = await self.get_roster_version(session)
+                cached_couriers = self.roster_cache.get_all(version=version)
+                if cached_couriers is not None:
+                    return cached_couriers
+                return await self.load_roster(session, version=version)
+
+    async def load_roster(
+        self, session: AsyncSession, version: int
+    ) -> list[CourierModel]:
+        result = await session.execute(select(Courier))
+        couriers = [
+            CourierModel(
+                courier_id=courier.id,
+                courier_type=courier.courier_type,
+                regions=courier.regions,
+                working_hours=courier.working_hours,
+            )
+            for courier in result.scalars().all()
+        ]
+        self.roster_cache.set_all(couriers=couriers, version=version)
+        return couriers
+
+    @staticmethod
+    async def get_roster_version(session: AsyncSession) -> int:
+        stmt = select(RosterVersion.version).where(RosterVersion.id == 1)
+        result = await session.execute(stmt)
+        return result.scalar_one()
+
+    async def copy_couriers(
+        self, *, couriers_model: CouriersList
+    ) -> CouriersList:
+        async with begin() as connection:
+            ids, _ = await self.reserve_ids(
+                connection, Courier, len(couriers_model.couriers)
+            )
+            created_couriers = [
+                CourierModel(
+                    courier_id=courier_id,
+                    courier_type=courier.courier_type,
+                    regions=courier.regions,
+                    working_hours=courier.working_hours,
+                )
+                for courier_id, courier in zip(ids, couriers_model.couriers)
+            ]
+            await self.copy_records(
+                connection,
+                Courier,
+                columns=("id", "courier_type", "regions", "working_hours"),
+                records=[
+                    (
+                        courier.id,
+                        courier.courier_type.value,
+                        courier.regions,
+                        courier.working_hours,
+                    )
+                    for courier in created_couriers
+                ],
+            )
+        return CouriersList(couriers=created_couriers)
+
+    @staticmethod
+    async def reserve_ids(
+        connection: AsyncConnection, entity, count: int
+    ) -> tuple[list[int], datetime]:
+        stmt = select(
+            func.nextval(
+                func.pg_get_serial_sequence(entity.__tablename__, "id")
+            ),
+            func.localtimestamp(),
+        ).select_from(func.generate_series(1, count))
+        result = (await connection.execute(stmt)).all()
+        return sorted(row[0] for row in result), result[0][1]
+
+    @staticmethod
+    async def copy_records(
+        connection: AsyncConnection,
+        entity,
+        columns: tuple[str, ...],
+        records: list[tuple],
+    ) -> None:
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            entity.__tablename__, records=records, columns=columns
+        )
+
     async def create_orders(
         self, *, orders_model: OrdersList
     ) -> list[OrderModel]:
+        if len(orders_model.orders) >= BULK_INSERT_THRESHOLD:
+            return await self.copy_orders(orders_model=orders_model)
+
         orders = [Order(**order.dict()) for order in orders_model.orders]
-        async with AsyncSession(engine) as session:
+        async with AsyncSession(await get_bind()) as session:
             async with session.begin():
                 session.add_all(orders)
                 await session.flush()
@@ -127,8 +258,53 @@ class LavkaPostgresRepository(LavkaAbstractRepository):
             await session.commit()
         return created_orders
 
+    async def copy_orders(
+        self, *, orders_model: OrdersList
+    ) -> list[OrderModel]:
+        async with begin() as connection:
+            ids, created_at = await self.reserve_ids(
+                connection, Order, len(orders_model.orders)
+            )
+            created_orders = [
+                OrderModel(
+                    order_id=order_id,
+                    weight=order.weight,
+                    regions=order.regions,
+                    delivery_hours=order.delivery_hours,
+                    cost=order.cost,
+                    completed_time=order.completed_time,
+                )
+                for order_id, order in zip(ids, orders_model.orders)
+            ]
+            await self.copy_records(
+                connection,
+                Order,
+                columns=(
+                    "id",
+                    "weight",
+                    "regions",
+                    "delivery_hours",
+                    "cost",
+                    "completed_time",
+                    "created_at",
+                ),
+                records=[
+                    (
+                        order.id,
+                        order.weight,
+                        order.regions,
+                        order.delivery_hours,
+                        order.cost,
+                        order.completed_time,
+                        created_at,
+                    )
+                    for order in created_orders
+                ],
+            )
+        return created_orders
+
     async def get_order(self, *, order_id: int) -> Optional[OrderModel]:
-        async with AsyncSession(engine) as session:
+        async with AsyncSession(await get_bind()) as session:
             stmt = select(Order).where(Order.id == order_id)
             result = await session.execute(stmt)
             order = result.scalar_one_or_none()
@@ -146,7 +322,7 @@ class LavkaPostgresRepository(LavkaAbstractRepository):
             )
 
     async def get_orders(self, *, offset: int, limit: int) -> list[OrderModel]:
-        async with AsyncSession(engine) as session:
+        async with AsyncSession(await get_bind()) as session:
             async with session.begin():
                 stmt = select(Order).offset(offset).limit(limit)
                 result = await session.execute(stmt)
@@ -163,40 +339,325 @@ class LavkaPostgresRepository(LavkaAbstractRepository):
                     for order in orders
                 ]
 
+    async def get_orders_after(
+        self, after_id: int, limit: int
+    ) -> list[OrderModel]:
+        async with AsyncSession(await get_bind()) as session:
+            async with session.begin():
+                stmt = (
+                    select(Order)
+                    .where(Order.id > after_id)
+                    .order_by(Order.id)
+                    .limit(limit)
+                )
+                result = await session.execute(stmt)
+                return [
+                    OrderModel(
+                        order_id=order.id,
+                        weight=order.weight,
+                        regions=order.regions,
+                        delivery_hours=order.delivery_hours,
+                        cost=order.cost,
+                        completed_time=order.completed_time,
+                    )
+                    for order in result.scalars().all()
+                ]
+
     async def complete_orders(
         self, *, complete_orders_model: CompleteOrderList
     ):
-        async with AsyncSession(engine) as session:
-            order_ids = [
-                info.order_id for info in complete_orders_model.complete_info
-            ]
+        complete_info = complete_orders_model.complete_info
+        order_ids = list(
+            dict.fromkeys(info.order_id for info in complete_info)
+        )
+        orders_table = Order.__table__
+        async with AsyncSession(await get_bind()) as session:
             async with session.begin():
-                stmt = select(Order).filter(Order.id.in_(order_ids))
+                stmt = (
+                    select(orders_table)
+                    .where(
+                        orders_table.c.id
+                        == any_(literal(order_ids, ARRAY(Integer)))
+                    )
+                    .with_for_update()
+                )
+                result = await session.execute(stmt)
+                orders = {order.id: order for order in result.all()}
+                courier_ids = list({info.courier_id for info in complete_info})
+                stmt = select(Courier.id).where(
+                    Courier.id == any_(literal(courier_ids, ARRAY(Integer)))
+                )
                 result = await session.execute(stmt)
-                orders = {order.id: order for order in result.scalars().all()}
-                for info in complete_orders_model.complete_info:
-                    order = orders.get(info.order_id)
-                    if order is None:
-                        return None
-                    if order.courier_id is None:
-                        current_courier = await self.get_courier(
-                            courier_id=info.courier_id
+                completions = self.get_completions(
+                    complete_info=complete_info,
+                    orders={
+                        order.id: (order.courier_id, order.completed_time)
+                        for order in orders.values()
+                    },
+                    courier_ids=set(result.scalars().all()),
+                )
+                if completions is None:
+                    return None
+
+                if completions:
+                    completed = self.unnest(
+                        "completed",
+                        columns=(
+                            column("id", Integer),
+                            column("courier_id", Integer),
+                            column("completed_time", DateTime),
+                        ),
+                        rows=[
+                            (order_id, courier_id, completed_time)
+                            for order_id, (
+                                courier_id,
+                                completed_time,
+                            ) in completions.items()
+                        ],
+                    )
+                    stmt = (
+                        update(orders_table)
+                        .where(orders_table.c.id == completed.c.id)
+                        .values(
+                            courier_id=completed.c.courier_id,
+                            completed_time=completed.c.completed_time,
                         )
-                        if current_courier is not None:
-                            order.completed_time = info.complete_time.replace(
-                                tzinfo=None
-                            )
-                            order.courier_id = info.courier_id
-                    elif (
-                        order.courier_id != info.courier_id
-                        or order.completed_time
-                        != info.complete_time.replace(tzinfo=None)
-                    ):
-                        return None
+                        .returning(*orders_table.c)
+                    )
+                    result = await session.execute(stmt)
+                    completed_orders = result.all()
+                    orders.update(
+                        (order.id, order) for order in completed_orders
+                    )
+                    earnings = {}
+                    for order in completed_orders:
+                        day_earnings = earnings.setdefault(
+                            (order.courier_id, order.completed_time.date()),
+                            [0, 0],
+                        )
+                        day_earnings[0] += order.cost
+                        day_earnings[1] += 1
+                    await session.execute(self.get_earnings_upsert(earnings))
+                await session.commit()
+
+        return [
+            OrderModel(
+                order_id=order.id,
+                weight=order.weight,
+                regions=order.regions,
+                delivery_hours=order.delivery_hours,
+                cost=order.cost,
+                completed_time=order.completed_time,
+            )
+            for order in map(orders.get, order_ids)
+        ]
+
+    @staticmethod
+    def unnest(name: str, columns: tuple, rows: list):
+        # Each row value would be a bind parameter of its own, and asyncpg
+        # allows at most 32767 of them per statement, so the rows are
+        # passed as one array per column instead.
+        arrays = list(zip(*rows)) or [()] * len(columns)
+        return (
+            func.unnest(
+                *(
+                    literal(list(array), ARRAY(value_column.type))
+                    for value_column, array in zip(columns, arrays)
+                )
+            )
+            .table_valued(*columns)
+            .render_derived(name=name)
+        )
+
+    @classmethod
+    def get_earnings_upsert(cls, earnings: dict[tuple[int, date], list]):
+        earned = cls.unnest(
+            "earned",
+            columns=(
+                column("courier_id", Integer),
+                column("day", Date),
+                column("cost_sum", Float),
+                column("order_count", Integer),
+            ),
+            rows=[
+                (courier_id, day, cost_sum, order_count)
+                for (courier_id, day), (
+                    cost_sum,
+                    order_count,
+                ) in earnings.items()
+            ],
+        )
+        stmt = pg_insert(CourierDailyEarnings).from_select(
+            ["courier_id", "day", "cost_sum", "order_count"],
+            select(earned),
+        )
+        return stmt.on_conflict_do_update(
+            index_elements=[
+                CourierDailyEarnings.courier_id,
+                CourierDailyEarnings.day,
+            ],
+            set_={
+                "cost_sum": CourierDailyEarnings.cost_sum
+                + stmt.excluded.cost_sum,
+                "order_count": CourierDailyEarnings.order_count
+                + stmt.excluded.order_count,
+            },
+        )
+
+    async def rebuild_earnings_rollup(self) -> int:
+        completed_day = func.date(Order.completed_time)
+        async with AsyncSession(await get_bind()) as session:
+            async with session.begin():
+                # Completions upsert into the rollup after updating orders,
+                # so holding this lock keeps them from being counted twice.
+                await session.execute(
+                    text("LOCK TABLE courier_daily_earnings IN EXCLUSIVE MODE")
+                )
+                await session.execute(delete(CourierDailyEarnings))
+                result = await session.execute(
+                    insert(CourierDailyEarnings).from_select(
+                        ["courier_id", "day", "cost_sum", "order_count"],
+                        select(
+                            Order.courier_id,
+                            completed_day,
+                            func.sum(Order.cost),
+                            func.count(Order.id),
+                        )
+                        .where(Order.courier_id != null())
+                        .where(Order.completed_time != null())
+                        .group_by(Order.courier_id, completed_day),
+                    )
+                )
                 await session.commit()
+                return result.rowcount
+
+    async def get_cost_sum_and_order_count(
+        self, courier_id: int, start_date: datetime, end_date: datetime
+    ):
+        totals = await self.get_cost_sums_and_order_counts(
+            courier_ids=[courier_id], start_date=start_date, end_date=end_date
+        )
+        return totals.get(courier_id, (None, 0))
+
+    async def get_cost_sums_and_order_counts(
+        self,
+        courier_ids: Optional[list[int]],
+        start_date: datetime,
+        end_date: datetime,
+    ) -> dict[int, tuple[float, int]]:
+        stmt = self.get_totals_statement(
+            courier_ids=courier_ids, start_date=start_date, end_date=end_date
+        )
+        async with AsyncSession(await get_bind()) as session:
+            async with session.begin():
+                result = await session.execute(stmt)
+                return {
+                    courier_id: (cost_sum, order_count)
+                    for courier_id, cost_sum, order_count in result.all()
+                }
+
+    async def stream_couriers_totals(
+        self,
+        courier_ids: Optional[list[int]],
+        start_date: datetime,
+        end_date: datetime,
+        chunk_size: int,
+    ) -> AsyncIterator[list[tuple[CourierModel, Optional[float], int]]]:
+        totals = self.get_totals_statement(
+            courier_ids=courier_ids, start_date=start_date, end_date=end_date
+        ).subquery()
+        stmt = (
+            select(Courier, totals.c.cost_sum, totals.c.order_count)
+            .outerjoin(totals, totals.c.courier_id == Courier.id)
+            .order_by(Courier.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        if courier_ids is not None:
+            stmt = stmt.where(
+                Courier.id == any_(literal(list(courier_ids), ARRAY(Integer)))
+            )
+        async with AsyncSession(await get_bind()) as session:
+            async with session.begin():
+                result = await session.stream(stmt)
+                async for rows in result.partitions(chunk_size):
+                    yield [
+                        (
+                            CourierModel(
+                                courier_id=courier.id,
+                                courier_type=courier.courier_type,
+                                regions=courier.regions,
+                                working_hours=courier.working_hours,
+                            ),
+                            cost_sum,
+                            order_count or 0,
+                        )
+                        for courier, cost_sum, order_count in rows
+                    ]
+
+    @classmethod
+    def get_totals_statement(
+        cls,
+        courier_ids: Optional[list[int]],
+        start_date: datetime,
+        end_date: datetime,
+    ):
+        if cls.is_start_of_day(start_date) and cls.is_start_of_day(end_date):
+            stmt = (
+                select(
+                    CourierDailyEarnings.courier_id,
+                    func.sum(CourierDailyEarnings.cost_sum).label("cost_sum"),
+                    func.sum(CourierDailyEarnings.order_count).label(
+                        "order_count"
+                    ),
+                )
+                .where(
+                    and_(
+                        CourierDailyEarnings.day >= start_date.date(),
+                        CourierDailyEarnings.day < end_date.date(),
+                    )
+                )
+                .group_by(CourierDailyEarnings.courier_id)
+            )
+            courier_id_column = CourierDailyEarnings.courier_id
+        else:
+            stmt = (
+                select(
+                    Order.courier_id,
+                    func.sum(Order.cost).label("cost_sum"),
+                    func.count(Order.id).label("order_count"),
+                )
+                .where(
+                    and_(
+                        Order.completed_time >= start_date,
+                        Order.completed_time < end_date,
+                    )
+                )
+                .group_by(Order.courier_id)
+            )
+            courier_id_column = Order.courier_id
+        if courier_ids is not None:
+            stmt = stmt.where(
+                courier_id_column
+                == any_(literal(list(courier_ids), ARRAY(Integer)))
+            )
+        return stmt
 
+    async def get_orders_to_assign(self, date: datetime) -> list[OrderModel]:
+        start_of_day, end_of_day = self.get_days_range(
+            start_date=date, end_date=date
+        )
+        async with AsyncSession(await get_bind()) as session:
             async with session.begin():
-                stmt = select(Order).filter(Order.id.in_(order_ids))
+                stmt = (
+                    select(Order)
+                    .filter(
+                        and_(
+                            Order.created_at >= start_of_day,
+                            Order.created_at < end_of_day,
+                        )
+                    )
+                    .filter(Order.courier_id == null())
+                )
                 result = await session.execute(stmt)
                 orders = result.scalars().all()
                 return [
@@ -211,35 +672,65 @@ class LavkaPostgresRepository(LavkaAbstractRepository):
                     for order in orders
                 ]
 
-    async def get_cost_sum_and_order_count(
-        self, courier_id: int, start_date: datetime, end_date: datetime
-    ):
-        async with AsyncSession(engine) as session:
+    async def stream_orders_to_assign(
+        self, date: datetime, chunk_size: int
+    ) -> AsyncIterator[list[OrderModel]]:
+        start_of_day, end_of_day = self.get_days_range(
+            start_date=date, end_date=date
+        )
+        async with AsyncSession(await get_bind()) as session:
             async with session.begin():
                 stmt = (
-                    select(func.sum(Order.cost), func.count(Order.id))
-                    .where(Order.courier_id == courier_id)
-                    .where(Order.completed_time >= start_date)
-                    .where(Order.completed_time < end_date)
+                    select(
+                        Order.id,
+                        Order.weight,
+                        Order.regions,
+                        Order.delivery_hours,
+                        Order.cost,
+                    )
+                    .filter(
+                        and_(
+                            Order.created_at >= start_of_day,
+                            Order.created_at < end_of_day,
+                        )
+                    )
+                    .filter(Order.courier_id == null())
+                    .order_by(Order.weight.desc(), Order.id)
+                    .execution_options(yield_per=chunk_size)
                 )
-                result = await session.execute(stmt)
-                cost_sum, order_count = result.one_or_none()
-                return cost_sum, order_count
+                result = await session.stream(stmt)
+                async for rows in result.partitions(chunk_size):
+                    yield [
+                        OrderModel(
+                            order_id=row.id,
+                            weight=row.weight,
+                            regions=row.regions,
+                            delivery_hours=row.delivery_hours,
+                            cost=row.cost,
+                        )
+                        for row in rows
+                    ]
 
-    async def get_orders_to_assign(self, date: datetime) -> list[OrderModel]:
-        start_of_day = date.replace(hour=0, minute=0, second=0, microsecond=0)
-        end_of_day = start_of_day + timedelta(days=1)
-        async with AsyncSession(engine) as session:
+    async def get_unscheduled_orders(self, date: datetime) -> list[OrderModel]:
+        start_of_day, end_of_day = self.get_days_range(
+            start_date=date, end_date=date
+        )
+        async with AsyncSession(await get_bind()) as session:
             async with session.begin():
                 stmt = (
                     select(Order)
                     .filter(
                         and_(
                             Order.created_at >= start_of_day,
-                            Order.created_at <= end_of_day,
+                            Order.created_at < end_of_day,
                         )
                     )
                     .filter(Order.courier_id == null())
+                    .filter(
+                        ~exists().where(
+                            OrderDeliverySchedule.order_id == Order.id
+                        )
+                    )
                 )
                 result = await session.execute(stmt)
                 orders = result.scalars().all()
@@ -255,62 +746,347 @@ class LavkaPostgresRepository(LavkaAbstractRepository):
                     for order in orders
                 ]
 
-    async def save_schedule(self, time_slots: dict, date: datetime):
+    async def get_orders_to_assign_by_date(
+        self, start_date: datetime, end_date: datetime
+    ) -> dict[date, list[OrderModel]]:
+        start_of_range, end_of_range = self.get_days_range(
+            start_date=start_date, end_date=end_date
+        )
+        async with AsyncSession(await get_bind()) as session:
+            async with session.begin():
+                stmt = (
+                    select(Order)
+                    .filter(
+                        and_(
+                            Order.created_at >= start_of_range,
+                            Order.created_at < end_of_range,
+                        )
+                    )
+                    .filter(Order.courier_id == null())
+                )
+                result = await session.execute(stmt)
+                orders_by_date = {}
+                for order in result.scalars().all():
+                    orders_by_date.setdefault(
+                        order.created_at.date(), []
+                    ).append(
+                        OrderModel(
+                            order_id=order.id,
+                            weight=order.weight,
+                            regions=order.regions,
+                            delivery_hours=order.delivery_hours,
+                            cost=order.cost,
+                            completed_time=order.completed_time,
+                        )
+                    )
+                return orders_by_date
+
+    @staticmethod
+    def is_start_of_day(value: datetime) -> bool:
+        return value == datetime.combine(value.date(), datetime.min.time())
+
+    @staticmethod
+    def get_days_range(
+        start_date: datetime, end_date: datetime
+    ) -> tuple[datetime, datetime]:
+        start_of_range = start_date.replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        end_of_range = end_date.replace(
+            hour=0, minute=0, second=0, microsecond=0
+        ) + timedelta(days=1)
+        return start_of_range, end_of_range
+
+    @staticmethod
+    def get_schedule_rows(time_slots: dict, date: datetime) -> list[tuple]:
+        schedule_rows = []
+        for courier, value in time_slots.items():
+            for schedule_record in value:
+                group_time = schedule_record.get_start_date(date)
+                schedule_rows.extend(
+                    (
+                        date,
+                        courier,
+                        order,
+                        group_order_id,
+                        schedule_record.order_ids[0],
+                        group_time,
+                        schedule_record.weight,
+                        schedule_record.cost,
+                    )
+                    for group_order_id, order in enumerate(
+                        schedule_record.order_ids
+                    )
+                )
+        return schedule_rows
+
+    async def save_schedules(self, schedules: dict[datetime, dict]) -> None:
+        schedule_rows = []
+        for schedule_date, time_slots in schedules.items():
+            schedule_rows.extend(
+                self.get_schedule_rows(
+                    time_slots=time_slots, date=schedule_date
+                )
+            )
+        if not schedule_rows:
+            return
+        async with begin() as connection:
+            await self.copy_records(
+                connection,
+                OrderDeliverySchedule,
+                columns=SCHEDULE_COLUMNS,
+                records=schedule_rows,
+            )
+
+    @asynccontextmanager
+    async def schedule_transaction(
+        self, date: datetime
+    ) -> AsyncIterator[None]:
+        async with transaction() as connection:
+            await self.lock_schedule(connection, date)
+            yield
+
+    async def get_scheduled_slots(
+        self, date: datetime, completed_only: bool = False
+    ) -> dict[int, list[TimeSlot]]:
+        start_of_day, end_of_day = self.get_days_range(
+            start_date=date, end_date=date
+        )
+        async with AsyncSession(await get_bind()) as session:
+            async with session.begin():
+                stmt = (
+                    select(
+                        OrderDeliverySchedule.courier_id,
+                        OrderDeliverySchedule.order_id,
+                        OrderDeliverySchedule.lead_order_id,
+                        OrderDeliverySchedule.group_time,
+                        OrderDeliverySchedule.group_weight,
+                        OrderDeliverySchedule.group_cost,
+                    )
+                    .filter(
+                        and_(
+                            OrderDeliverySchedule.date >= start_of_day,
+                            OrderDeliverySchedule.date < end_of_day,
+                        )
+                    )
+                    .order_by(
+                        OrderDeliverySchedule.courier_id,
+                        OrderDeliverySchedule.group_time,
+                        OrderDeliverySchedule.lead_order_id,
+                        OrderDeliverySchedule.group_order_id,
+                    )
+                )
+                if completed_only:
+                    stmt = stmt.join(
+                        Order, Order.id == OrderDeliverySchedule.order_id
+                    ).filter(Order.completed_time.is_not(None))
+                result = await session.execute(stmt)
+                scheduled_slots = {}
+                for courier_id, courier_rows in itertools.groupby(
+                    result.all(), key=lambda x: x.courier_id
+                ):
+                    courier_slots = scheduled_slots[courier_id] = []
+                    for (group_time, _), slot_rows in itertools.groupby(
+                        courier_rows,
+                        key=lambda x: (x.group_time, x.lead_order_id),
+                    ):
+                        slot_rows = list(slot_rows)
+                        courier_slots.append(
+                            TimeSlot(
+                                start_minute=TimeSlot.get_start_minute(
+                                    start_date=group_time, date=date
+                                ),
+                                order_ids=[row.order_id for row in slot_rows],
+                                weight=slot_rows[0].group_weight,
+                                cost=slot_rows[0].group_cost,
+                            )
+                        )
+                return scheduled_slots
+
+    async def save_schedule_delta(
+        self, time_slots: dict, date: datetime, order_ids: Iterable[int]
+    ) -> None:
+        order_ids = set(order_ids)
         schedule_records = []
+        group_updates = []
         for courier, value in time_slots.items():
             for schedule_record in value:
-                for group_order_id, order in enumerate(schedule_record[1]):
-                    new_schedule_record = OrderDeliverySchedule(
+                new_records = [
+                    OrderDeliverySchedule(
                         courier_id=courier,
                         date=date,
                         order_id=order,
                         group_order_id=group_order_id,
-                        group_time=schedule_record[0],
-                        group_weight=schedule_record[2],
-                        group_cost=schedule_record[3],
+                        lead_order_id=schedule_record.order_ids[0],
+                        group_time=schedule_record.get_start_date(date),
+                        group_weight=schedule_record.weight,
+                        group_cost=schedule_record.cost,
                     )
-                    schedule_records.append(new_schedule_record)
-        async with AsyncSession(engine) as session:
+                    for group_order_id, order in enumerate(
+                        schedule_record.order_ids
+                    )
+                    if order in order_ids
+                ]
+                if not new_records:
+                    continue
+                schedule_records.extend(new_records)
+                group_updates.extend(
+                    {
+                        "b_order_id": order,
+                        "b_group_weight": schedule_record.weight,
+                        "b_group_cost": schedule_record.cost,
+                    }
+                    for order in schedule_record.order_ids
+                    if order not in order_ids
+                )
+
+        start_of_day, end_of_day = self.get_days_range(
+            start_date=date, end_date=date
+        )
+        schedule_table = OrderDeliverySchedule.__table__
+        async with AsyncSession(await get_bind()) as session:
             async with session.begin():
+                await self.lock_schedule(session, start_of_day)
                 session.add_all(schedule_records)
-                await session.commit()
-        async with AsyncSession(engine) as session:
-            async with session.begin():
-                stmt = (
-                    select(OrderDeliverySchedule, Courier, Order)
-                    .select_from(
-                        OrderDeliverySchedule.__table__.join(
-                            Courier,
-                            OrderDeliverySchedule.courier_id == Courier.id,
-                        ).join(
-                            Order, OrderDeliverySchedule.order_id == Order.id
+                if group_updates:
+                    stmt = (
+                        update(schedule_table)
+                        .where(
+                            and_(
+                                schedule_table.c.order_id
+                                == bindparam("b_order_id"),
+                                schedule_table.c.date >= start_of_day,
+                                schedule_table.c.date < end_of_day,
+                            )
+                        )
+                        .values(
+                            group_weight=bindparam("b_group_weight"),
+                            group_cost=bindparam("b_group_cost"),
                         )
                     )
-                    .order_by(
-                        OrderDeliverySchedule.date,
-                        OrderDeliverySchedule.courier_id,
-                        OrderDeliverySchedule.group_order_id,
+                    await session.execute(stmt, group_updates)
+                await session.commit()
+
+    async def save_schedule(self, time_slots: dict, date: datetime) -> None:
+        async with begin() as connection:
+            await self.copy_schedule(
+                connection, time_slots=time_slots, date=date
+            )
+
+    @classmethod
+    async def copy_schedule(
+        cls,
+        connection: AsyncConnection,
+        time_slots: dict,
+        date: datetime,
+        skip_order_ids: Collection[int] = (),
+    ) -> None:
+        schedule_rows = [
+            schedule_row
+            for schedule_row in cls.get_schedule_rows(
+                time_slots=time_slots, date=date
+            )
+            if schedule_row[2] not in skip_order_ids
+        ]
+        if not schedule_rows:
+            return
+        await cls.copy_records(
+            connection,
+            OrderDeliverySchedule,
+            columns=SCHEDULE_COLUMNS,
+            records=schedule_rows,
+        )
+
+    @staticmethod
+    async def lock_schedule(
+        connection: Union[AsyncConnection, AsyncSession], date: datetime
+    ) -> None:
+        # Serializes the writers of one day's schedule until commit.
+        await connection.execute(
+            select(func.pg_advisory_xact_lock(date.date().toordinal()))
+        )
+
+    async def replace_schedule(self, time_slots: dict, date: datetime) -> None:
+        start_of_day, end_of_day = self.get_days_range(
+            start_date=date, end_date=date
+        )
+        async with begin() as connection:
+            await self.lock_schedule(connection, start_of_day)
+            await connection.execute(
+                delete(OrderDeliverySchedule).where(
+                    and_(
+                        OrderDeliverySchedule.date >= start_of_day,
+                        OrderDeliverySchedule.date < end_of_day,
+                        ~exists().where(
+                            and_(
+                                Order.id == OrderDeliverySchedule.order_id,
+                                Order.completed_time.is_not(None),
+                            )
+                        ),
                     )
                 )
-                result_proxy = await session.execute(stmt)
-                result = self.transform_assignment_result(
-                    result_proxy=result_proxy
+            )
+            # Orders completed while the day was being solved were kept.
+            result = await connection.execute(
+                select(OrderDeliverySchedule.order_id).filter(
+                    and_(
+                        OrderDeliverySchedule.date >= start_of_day,
+                        OrderDeliverySchedule.date < end_of_day,
+                    )
                 )
-
-                return result[0] if result else None
+            )
+            await self.copy_schedule(
+                connection,
+                time_slots=time_slots,
+                date=date,
+                skip_order_ids=set(result.scalars()),
+            )
 
     async def get_count_of_schedule(self, date: datetime) -> int:
-        async with AsyncSession(engine) as session:
+        start_of_day, end_of_day = self.get_days_range(
+            start_date=date, end_date=date
+        )
+        async with AsyncSession(await get_bind()) as session:
             async with session.begin():
                 stmt = select(func.count(OrderDeliverySchedule.id)).filter(
-                    func.date(OrderDeliverySchedule.date) == date.date()
+                    and_(
+                        OrderDeliverySchedule.date >= start_of_day,
+                        OrderDeliverySchedule.date < end_of_day,
+                    )
                 )
 
                 result_proxy = await session.execute(stmt)
                 return result_proxy.scalar()
 
+    async def get_scheduled_dates(
+        self, start_date: datetime, end_date: datetime
+    ) -> set[date]:
+        start_of_range, end_of_range = self.get_days_range(
+            start_date=start_date, end_date=end_date
+        )
+        async with AsyncSession(await get_bind()) as session:
+            async with session.begin():
+                stmt = (
+                    select(func.date(OrderDeliverySchedule.date))
+                    .filter(
+                        and_(
+                            OrderDeliverySchedule.date >= start_of_range,
+                            OrderDeliverySchedule.date < end_of_range,
+                        )
+                    )
+                    .distinct()
+                )
+                result = await session.execute(stmt)
+                return set(result.scalars().all())
+
+    async def release_connection(self) -> None:
+        await release()
+
     async def get_couriers_assignments(self, courier_id: int, date: datetime):
-        async with AsyncSession(engine) as session:
+        start_of_day, end_of_day = self.get_days_range(
+            start_date=date, end_date=date
+        )
+        async with AsyncSession(await get_bind()) as session:
             async with session.begin():
                 stmt = (
                     select(OrderDeliverySchedule, Courier, Order)
@@ -324,16 +1100,17 @@ class LavkaPostgresRepository(LavkaAbstractRepository):
                     )
                     .filter(
                         and_(
-                            func.date(OrderDeliverySchedule.date) == date,
-                            Courier.id == courier_id
+                            OrderDeliverySchedule.date >= start_of_day,
+                            OrderDeliverySchedule.date < end_of_day,
+                            OrderDeliverySchedule.courier_id == courier_id
                             if courier_id > -1
                             else True,
                         )
                     )
                     .order_by(
-                        OrderDeliverySchedule.date,
                         OrderDeliverySchedule.courier_id,
                         OrderDeliverySchedule.group_order_id,
+                        OrderDeliverySchedule.id,
                     )
                 )
                 result_proxy = await session.execute(stmt)
@@ -347,7 +1124,7 @@ class LavkaPostgresRepository(LavkaAbstractRepository):
         schedules = result_proxy.fetchall()
         result_proxy.close()
         result = []
-        for date, courier_schedule in itertools.groupby(
+        for schedule_date, courier_schedule in itertools.groupby(
             schedules,
             key=lambda x: x.OrderDeliverySchedule.date.date(),
         ):
@@ -382,6 +1159,8 @@ class LavkaPostgresRepository(LavkaAbstractRepository):
                     CourierScheduleModel(courier_id=courier_id, orders=groups)
                 )
             result.append(
-                DeliveryScheduleModel(date=date.isoformat(), couriers=couriers)
+                DeliveryScheduleModel(
+                    date=schedule_date.isoformat(), couriers=couriers
+                )
             )
             return result
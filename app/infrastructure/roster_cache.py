@@ -0,0 +1,46 @@
+from typing import Iterable, Optional
+
+from models import CourierModel, RosterCacheStats
+
+
+class RosterCache:
+    """Couriers of the roster kept in process memory.
+
+    The cache is only served while its version still matches the roster
+    version in the database, a counter bumped by a trigger on every
+    statement that changes the couriers table, truncation included.
+    """
+
+    def __init__(self):
+        self.couriers: dict[int, CourierModel] = {}
+        self.version: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+
+    def get_all(self, version: int) -> Optional[list[CourierModel]]:
+        if version != self.version:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return list(self.couriers.values())
+
+    def set_all(self, couriers: Iterable[CourierModel], version: int) -> None:
+        self.couriers = {courier.id: courier for courier in couriers}
+        self.version = version
+
+    def get(self, courier_id: int, version: int) -> Optional[CourierModel]:
+        courier = (
+            self.couriers.get(courier_id) if version == self.version else None
+        )
+        if courier is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return courier
+
+    def get_stats(self) -> RosterCacheStats:
+        return RosterCacheStats(
+            hits=self.hits,
+            misses=self.misses,
+            size=len(self.couriers),
+        )
@@ -0,0 +1,88 @@
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Optional, Union
+
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from infrastructure.entities import engine
+
+
+class UnitOfWork:
+    """Connection shared by the repository calls of one request.
+
+    The connection is checked out on first use, so requests that never
+    reach the database do not take one from the pool, and can be released
+    early, before CPU-bound work, to be checked out again on next use.
+    """
+
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+        self.connection: Optional[AsyncConnection] = None
+
+    async def __aenter__(self) -> "UnitOfWork":
+        current_unit_of_work.set(self)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        current_unit_of_work.set(None)
+        await self.release()
+
+    async def connect(self) -> AsyncConnection:
+        if self.connection is None:
+            self.connection = await self.engine.connect()
+        return self.connection
+
+    async def release(self) -> None:
+        connection, self.connection = self.connection, None
+        if connection is not None:
+            await connection.close()
+
+
+current_unit_of_work: ContextVar[Optional[UnitOfWork]] = ContextVar(
+    "current_unit_of_work", default=None
+)
+
+
+async def get_bind() -> Union[AsyncEngine, AsyncConnection]:
+    unit_of_work = current_unit_of_work.get()
+    return engine if unit_of_work is None else await unit_of_work.connect()
+
+
+async def release() -> None:
+    unit_of_work = current_unit_of_work.get()
+    if unit_of_work is not None:
+        await unit_of_work.release()
+
+
+@asynccontextmanager
+async def begin() -> AsyncIterator[AsyncConnection]:
+    unit_of_work = current_unit_of_work.get()
+    if unit_of_work is None:
+        async with engine.begin() as connection:
+            yield connection
+    else:
+        connection = await unit_of_work.connect()
+        if connection.in_transaction():
+            # Joins a transaction opened by an enclosing begin().
+            yield connection
+            return
+        async with connection.begin():
+            yield connection
+
+
+@asynccontextmanager
+async def transaction() -> AsyncIterator[AsyncConnection]:
+    """One transaction for every get_bind() and begin() of the block."""
+    if current_unit_of_work.get() is not None:
+        async with begin() as connection:
+            yield connection
+        return
+    async with UnitOfWork(engine):
+        async with begin() as connection:
+            yield connection
+
+
+async def unit_of_work(request: Request):
+    async with request.app.container.unit_of_work():
+        yield
@@ -2,7 +2,7 @@ from fastapi import FastAPI
 
 from core.containers import Container
 from core.settings import settings
-from endpoints.api import couriers, orders
+from endpoints.api import couriers, orders, stats
 
 
 def get_application() -> FastAPI:
@@ -14,8 +14,10 @@ def get_application() -> FastAPI:
     container = Container()
     container.config.from_pydantic(settings)
     application.container = container
+    application.add_event_handler("shutdown", container.shutdown_resources)
     application.include_router(couriers.router)
     application.include_router(orders.router)
+    application.include_router(stats.router)
 
     return application
 
@@ -0,0 +1,51 @@
+"""05_roster_version
+
+Revision ID: 4c9e2b7d1a05
+Revises: d81c5a7e2f36
+Create Date: 2026-10-17 15:41:27.209318
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "4c9e2b7d1a05"
+down_revision = "d81c5a7e2f36"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "roster_version",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.execute("INSERT INTO roster_version (id, version) VALUES (1, 0)")
+    # A statement-level trigger also fires on TRUNCATE, which row-level
+    # triggers miss, and bumps the version once per bulk insert.
+    op.execute(
+        """
+        CREATE FUNCTION bump_roster_version() RETURNS trigger AS $$
+        BEGIN
+            UPDATE roster_version SET version = version + 1 WHERE id = 1;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER couriers_roster_version
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON couriers
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_roster_version()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER couriers_roster_version ON couriers")
+    op.execute("DROP FUNCTION bump_roster_version()")
+    op.drop_table("roster_version")
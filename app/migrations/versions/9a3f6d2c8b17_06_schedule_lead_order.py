@@ -0,0 +1,43 @@
+"""06_schedule_lead_order
+
+Revision ID: 9a3f6d2c8b17
+Revises: 4c9e2b7d1a05
+Create Date: 2026-10-17 17:12:05.831644
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "9a3f6d2c8b17"
+down_revision = "4c9e2b7d1a05"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "orders_delivery_schedule",
+        sa.Column("lead_order_id", sa.Integer(), nullable=True),
+    )
+    # Existing rows only know their start time, so slots of one courier
+    # that share it are taken to be one slot, as they were read before.
+    op.execute(
+        """
+        UPDATE orders_delivery_schedule AS schedule
+        SET lead_order_id = lead.order_id
+        FROM (
+            SELECT DISTINCT ON (courier_id, group_time)
+                courier_id, group_time, order_id
+            FROM orders_delivery_schedule
+            ORDER BY courier_id, group_time, group_order_id, id
+        ) AS lead
+        WHERE schedule.courier_id = lead.courier_id
+            AND schedule.group_time = lead.group_time
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("orders_delivery_schedule", "lead_order_id")
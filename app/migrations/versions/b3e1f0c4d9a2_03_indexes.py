@@ -0,0 +1,83 @@
+"""03_indexes
+
+Revision ID: b3e1f0c4d9a2
+Revises: 75581122486d
+Create Date: 2026-10-17 11:20:43.518204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "b3e1f0c4d9a2"
+down_revision = "75581122486d"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_orders_unassigned_created_at",
+            "orders",
+            ["created_at"],
+            postgresql_where=sa.text("courier_id IS NULL"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_orders_courier_id_completed_time",
+            "orders",
+            ["courier_id", "completed_time"],
+            postgresql_include=["cost"],
+            postgresql_where=sa.text("courier_id IS NOT NULL"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_orders_delivery_schedule_date",
+            "orders_delivery_schedule",
+            ["date"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_orders_delivery_schedule_courier_id_date",
+            "orders_delivery_schedule",
+            ["courier_id", "date"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_orders_delivery_schedule_order_id",
+            "orders_delivery_schedule",
+            ["order_id"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_orders_delivery_schedule_order_id",
+            table_name="orders_delivery_schedule",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_orders_delivery_schedule_courier_id_date",
+            table_name="orders_delivery_schedule",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_orders_delivery_schedule_date",
+            table_name="orders_delivery_schedule",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_orders_courier_id_completed_time",
+            table_name="orders",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_orders_unassigned_created_at",
+            table_name="orders",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,45 @@
+"""04_courier_daily_earnings
+
+Revision ID: d81c5a7e2f36
+Revises: b3e1f0c4d9a2
+Create Date: 2026-10-17 13:02:11.604387
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "d81c5a7e2f36"
+down_revision = "b3e1f0c4d9a2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "courier_daily_earnings",
+        sa.Column("courier_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("cost_sum", sa.Float(), nullable=False),
+        sa.Column("order_count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["courier_id"],
+            ["couriers.id"],
+        ),
+        sa.PrimaryKeyConstraint("courier_id", "day"),
+    )
+    op.execute(
+        """
+        INSERT INTO courier_daily_earnings
+            (courier_id, day, cost_sum, order_count)
+        SELECT courier_id, date(completed_time), sum(cost), count(id)
+        FROM orders
+        WHERE courier_id IS NOT NULL AND completed_time IS NOT NULL
+        GROUP BY courier_id, date(completed_time)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("courier_daily_earnings")
@@ -1,8 +1,87 @@
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from enum import Enum
-from typing import Optional
+from typing import Literal, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+
+
+def time_to_minutes(time_str: str) -> int:
+    hours, minutes = map(int, time_str.split(":"))
+    return hours * 60 + minutes
+
+
+class TimeIntervals:
+    __slots__ = ("ranges",)
+
+    def __init__(self, ranges: tuple[tuple[int, int], ...]):
+        self.ranges = ranges
+
+    @classmethod
+    def parse(cls, intervals: list[str]) -> "TimeIntervals":
+        ranges = []
+        for interval in intervals:
+            start_str, end_str = interval.split("-")
+            ranges.append(
+                (time_to_minutes(start_str), time_to_minutes(end_str))
+            )
+        return cls(tuple(ranges))
+
+    def __reduce__(self):
+        return TimeIntervals, (self.ranges,)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, TimeIntervals) and self.ranges == other.ranges
+
+    def __hash__(self) -> int:
+        return hash(self.ranges)
+
+
+class TimeSlot:
+    __slots__ = ("start_minute", "order_ids", "weight", "cost")
+
+    def __init__(
+        self,
+        start_minute: int,
+        order_ids: Optional[list[int]] = None,
+        weight: float = 0,
+        cost: float = 0,
+    ):
+        self.start_minute = start_minute
+        self.order_ids = [] if order_ids is None else order_ids
+        self.weight = weight
+        self.cost = cost
+
+    @staticmethod
+    def get_start_of_day(date: datetime) -> datetime:
+        return date.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    @classmethod
+    def get_start_minute(cls, start_date: datetime, date: datetime) -> int:
+        return (start_date - cls.get_start_of_day(date)) // timedelta(
+            minutes=1
+        )
+
+    def get_start_date(self, date: datetime) -> datetime:
+        return self.get_start_of_day(date) + timedelta(
+            minutes=self.start_minute
+        )
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, TimeSlot) and (
+            self.start_minute,
+            self.order_ids,
+            self.weight,
+            self.cost,
+        ) == (other.start_minute, other.order_ids, other.weight, other.cost)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (
+            f"TimeSlot(start_minute={self.start_minute}, "
+            f"order_ids={self.order_ids}, weight={self.weight}, "
+            f"cost={self.cost})"
+        )
 
 
 class CourierType(str, Enum):
@@ -16,6 +95,13 @@ class CourierModel(BaseModel):
     courier_type: CourierType
     regions: list[int]
     working_hours: list[str]
+    _working_intervals: Optional[TimeIntervals] = PrivateAttr(default=None)
+
+    @property
+    def working_intervals(self) -> TimeIntervals:
+        if self._working_intervals is None:
+            self._working_intervals = TimeIntervals.parse(self.working_hours)
+        return self._working_intervals
 
 
 class CouriersList(BaseModel):
@@ -28,6 +114,12 @@ class CouriersListResponse(BaseModel):
     offset: int
 
 
+class CouriersPageResponse(BaseModel):
+    couriers: list[CourierModel]
+    limit: int
+    next_cursor: Optional[str]
+
+
 class OrderModel(BaseModel):
     id: int = Field(default=None, alias="order_id")
     weight: float
@@ -35,12 +127,25 @@ class OrderModel(BaseModel):
     delivery_hours: list[str]
     cost: float
     completed_time: Optional[datetime] = None
+    _delivery_intervals: Optional[TimeIntervals] = PrivateAttr(default=None)
+
+    @property
+    def delivery_intervals(self) -> TimeIntervals:
+        if self._delivery_intervals is None:
+            self._delivery_intervals = TimeIntervals.parse(self.delivery_hours)
+        return self._delivery_intervals
 
 
 class OrdersList(BaseModel):
     orders: list[OrderModel]
 
 
+class OrdersPageResponse(BaseModel):
+    orders: list[OrderModel]
+    limit: int
+    next_cursor: Optional[str]
+
+
 class CompleteInfo(BaseModel):
     courier_id: int
     order_id: int
@@ -56,6 +161,12 @@ class CourierMetaInfo(CourierModel):
     rating: float = Field(default=None)
 
 
+class CouriersMetaInfoRequest(BaseModel):
+    courier_ids: Union[Literal["all"], list[int]]
+    start_date: date
+    end_date: date
+
+
 class GroupOrderModel(BaseModel):
     group_order_id: int
     orders: list[OrderModel]
@@ -69,3 +180,28 @@ class CourierScheduleModel(BaseModel):
 class DeliveryScheduleModel(BaseModel):
     date: str
     couriers: list[CourierScheduleModel]
+
+
+class AssignmentSummaryModel(BaseModel):
+    date: str
+    orders_count: int
+    assigned_count: int
+    couriers_count: int
+    planned: bool
+
+
+class RosterCacheStats(BaseModel):
+    hits: int
+    misses: int
+    size: int
+
+
+class PoolStats(BaseModel):
+    size: int
+    max_overflow: int
+    checked_out: int
+    utilization: Optional[float]
+    checkouts: int
+    checkout_timeouts: int
+    avg_checkout_wait_ms: float
+    max_checkout_wait_ms: float
@@ -0,0 +1,127 @@
+import gc
+from abc import ABC, abstractmethod
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Iterator, Optional
+
+from core.constants import COURIER_SETTINGS, SLOT_TEMPLATES_CACHE_SIZE
+from models import TimeSlot
+
+
+@contextmanager
+def gc_paused() -> Iterator[None]:
+    # Slots hold no reference cycles, so collections triggered by millions
+    # of fresh slot objects only rescan the roster and the orders.
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+@lru_cache(maxsize=SLOT_TEMPLATES_CACHE_SIZE)
+def get_slot_template(
+    ranges: tuple[tuple[int, int], ...], slot_time: int
+) -> tuple[int, ...]:
+    start_minutes = []
+    for start_minute, end_minute in ranges:
+        duration_minutes = end_minute - start_minute + slot_time
+        while duration_minutes >= slot_time:
+            start_minutes.append(start_minute)
+            start_minute += slot_time
+            duration_minutes -= slot_time
+    return tuple(start_minutes)
+
+
+class AssignmentEngine(ABC):
+    def __init__(
+        self, courier_settings: dict = COURIER_SETTINGS, time_budget: float = 1
+    ):
+        self.courier_settings = courier_settings
+        self.time_budget = time_budget
+
+    @abstractmethod
+    def assign(
+        self,
+        couriers: list,
+        orders: list,
+        date: datetime,
+        taken_slots: Optional[dict] = None,
+    ) -> dict:
+        pass
+
+    @staticmethod
+    def sort_orders(orders: list) -> list:
+        return sorted(
+            orders,
+            key=lambda current_order: current_order.weight,
+            reverse=True,
+        )
+
+    @staticmethod
+    def get_slot_time(settings: dict) -> int:
+        return settings["first_order_time"] + settings["next_order_time"] * (
+            settings["max_orders"] - 1
+        )
+
+    @staticmethod
+    def drop_taken_slots(
+        template: tuple[int, ...], taken_minutes: list[int]
+    ) -> tuple[int, ...]:
+        # A start minute repeats in the template once per overlapping
+        # interval, so each taken slot removes a single occurrence.
+        taken = Counter(taken_minutes)
+        start_minutes = []
+        for start_minute in template:
+            if taken[start_minute]:
+                taken[start_minute] -= 1
+            else:
+                start_minutes.append(start_minute)
+        return tuple(start_minutes)
+
+    def get_time_slots(
+        self, couriers, date, taken_slots: Optional[dict] = None
+    ) -> tuple[dict[Any, list[TimeSlot]], dict[Any, int]]:
+        time_slots = {}
+        available_slots = {}
+        with gc_paused():
+            for courier in couriers:
+                settings = self.courier_settings[courier.courier_type]
+                template = get_slot_template(
+                    ranges=courier.working_intervals.ranges,
+                    slot_time=self.get_slot_time(settings),
+                )
+                if taken_slots and courier.id in taken_slots:
+                    template = self.drop_taken_slots(
+                        template, taken_slots[courier.id]
+                    )
+                time_slots[courier.id] = [
+                    TimeSlot(start_minute) for start_minute in template
+                ]
+                available_slots[courier.id] = len(template)
+        return time_slots, available_slots
+
+    @staticmethod
+    def fill_time_slots(
+        time_slots: dict, available_slots: dict, scheduled_slots: dict
+    ) -> None:
+        for courier_id, courier_slots in scheduled_slots.items():
+            if courier_id not in time_slots:
+                continue
+            positions = {}
+            for pos, time_slot in enumerate(time_slots[courier_id]):
+                positions.setdefault(time_slot.start_minute, []).append(pos)
+            for scheduled_slot in courier_slots:
+                if not positions.get(scheduled_slot.start_minute):
+                    continue
+                time_slot = time_slots[courier_id][
+                    positions[scheduled_slot.start_minute].pop(0)
+                ]
+                time_slot.order_ids.extend(scheduled_slot.order_ids)
+                time_slot.weight = scheduled_slot.weight
+                time_slot.cost = scheduled_slot.cost
+                available_slots[courier_id] -= len(scheduled_slot.order_ids)
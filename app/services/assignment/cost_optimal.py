@@ -0,0 +1,267 @@
+import math
+import time
+from datetime import datetime
+from typing import Optional
+
+from services.assignment.greedy import GreedyEngine
+
+COST_EPSILON = 1e-9
+
+
+class CostOptimalEngine(GreedyEngine):
+    """Greedy assignment improved by local search within a time budget.
+
+    The search first tries to place unassigned orders, directly or by
+    moving one order out of a slot they fit in, and then empties groups
+    whose orders fit into other non-empty groups of lower total cost.
+    Orders of every group are finally delivered cheapest first, since only
+    the first order of a group is paid in full.
+
+    The time budget only bounds the local search: the greedy pass always
+    runs to completion, so the total time is the greedy time plus at most
+    the budget.
+    """
+
+    def assign(
+        self,
+        couriers: list,
+        orders: list,
+        date: datetime,
+        taken_slots: Optional[dict] = None,
+    ) -> dict:
+        deadline = time.monotonic() + self.time_budget
+        time_slots = super().assign(
+            couriers=couriers,
+            orders=orders,
+            date=date,
+            taken_slots=taken_slots,
+        )
+
+        self.time_slots = time_slots
+        self.orders = {order.id: order for order in orders}
+        self.couriers = {courier.id: courier for courier in couriers}
+        if time.monotonic() < deadline:
+            self.improve(deadline=deadline)
+        self.order_groups_by_cost()
+        return time_slots
+
+    def improve(self, deadline: float) -> None:
+        couriers = list(self.couriers.values())
+        self.region_couriers = self.get_region_couriers(
+            couriers=couriers,
+            available_slots={
+                courier.id: len(self.time_slots[courier.id])
+                for courier in couriers
+            },
+        )
+        self.slot_indexes = self.get_slot_indexes(
+            couriers=couriers, time_slots=self.time_slots
+        )
+        self.available_slots, self.placements = {}, {}
+        for courier_id, courier_slots in self.time_slots.items():
+            self.available_slots[courier_id] = len(courier_slots)
+            for pos, time_slot in enumerate(courier_slots):
+                self.available_slots[courier_id] -= len(time_slot.order_ids)
+                for order_id in time_slot.order_ids:
+                    self.placements[order_id] = (courier_id, pos)
+                time_slot.weight = self.get_group_weight(time_slot.order_ids)
+                self.slot_indexes[courier_id].update(pos)
+
+        unassigned = [
+            order
+            for order in self.sort_orders(self.orders.values())
+            if order.id not in self.placements
+        ]
+        for order in unassigned:
+            if time.monotonic() >= deadline:
+                return
+            self.insert_order(order)
+
+        groups = sorted(
+            (
+                (courier_id, pos)
+                for courier_id, courier_slots in self.time_slots.items()
+                for pos, time_slot in enumerate(courier_slots)
+                if time_slot.order_ids
+            ),
+            key=lambda group: len(
+                self.time_slots[group[0]][group[1]].order_ids
+            ),
+        )
+        for courier_id, pos in groups:
+            if time.monotonic() >= deadline:
+                return
+            self.eliminate_group(courier_id=courier_id, pos=pos)
+
+    def order_groups_by_cost(self) -> None:
+        for courier_id, courier_slots in self.time_slots.items():
+            settings = self.courier_settings[
+                self.couriers[courier_id].courier_type
+            ]
+            for time_slot in courier_slots:
+                time_slot.order_ids.sort(
+                    key=lambda order_id: self.orders[order_id].cost
+                )
+                time_slot.cost = 0
+                for number, order_id in enumerate(time_slot.order_ids):
+                    cost = self.orders[order_id].cost
+                    time_slot.cost += (
+                        cost
+                        if number == 0
+                        else cost * settings["next_delivery_cost"]
+                    )
+
+    def get_group_weight(self, order_ids: list) -> float:
+        return math.fsum(
+            self.orders[order_id].weight for order_id in order_ids
+        )
+
+    def get_group_cost(self, order_ids: list, next_delivery_cost: float):
+        if not order_ids:
+            return 0
+        costs = [self.orders[order_id].cost for order_id in order_ids]
+        cheapest = min(costs)
+        return cheapest + (sum(costs) - cheapest) * next_delivery_cost
+
+    def add_order(self, order, courier_id: int, pos: int) -> None:
+        time_slot = self.time_slots[courier_id][pos]
+        time_slot.order_ids.append(order.id)
+        time_slot.weight = self.get_group_weight(time_slot.order_ids)
+        self.slot_indexes[courier_id].update(pos)
+        self.available_slots[courier_id] -= 1
+        self.placements[order.id] = (courier_id, pos)
+
+    def remove_order(self, order) -> tuple[int, int]:
+        courier_id, pos = self.placements.pop(order.id)
+        time_slot = self.time_slots[courier_id][pos]
+        time_slot.order_ids.remove(order.id)
+        time_slot.weight = self.get_group_weight(time_slot.order_ids)
+        self.slot_indexes[courier_id].update(pos)
+        self.available_slots[courier_id] += 1
+        return courier_id, pos
+
+    def find_slot(self, order) -> Optional[tuple[int, int]]:
+        for courier in self.region_couriers.get(order.regions, {}).values():
+            settings = self.courier_settings[courier.courier_type]
+            if (
+                order.weight > settings["max_weight"]
+                or self.available_slots[courier.id] <= 0
+            ):
+                continue
+            pos = self.slot_indexes[courier.id].find(
+                intervals=order.delivery_intervals, weight=order.weight
+            )
+            if pos is not None:
+                return courier.id, pos
+        return None
+
+    def insert_order(self, order) -> bool:
+        placement = self.find_slot(order)
+        if placement is not None:
+            self.add_order(order, *placement)
+            return True
+
+        for courier in self.region_couriers.get(order.regions, {}).values():
+            settings = self.courier_settings[courier.courier_type]
+            if order.weight > settings["max_weight"]:
+                continue
+            slot_index = self.slot_indexes[courier.id]
+            for pos in slot_index.get_window_positions(
+                order.delivery_intervals
+            ):
+                time_slot = self.time_slots[courier.id][pos]
+                for moved_id in list(time_slot.order_ids):
+                    moved = self.orders[moved_id]
+                    if (
+                        time_slot.weight - moved.weight + order.weight
+                        > settings["max_weight"] + COST_EPSILON
+                    ):
+                        continue
+                    self.remove_order(moved)
+                    if (
+                        slot_index.find_in_range(
+                            lo=pos, hi=pos + 1, weight=order.weight
+                        )
+                        != pos
+                    ):
+                        self.add_order(moved, courier.id, pos)
+                        continue
+                    self.add_order(order, courier.id, pos)
+                    placement = self.find_slot(moved)
+                    if placement is not None:
+                        self.add_order(moved, *placement)
+                        return True
+                    self.remove_order(order)
+                    self.add_order(moved, courier.id, pos)
+        return False
+
+    def eliminate_group(self, courier_id: int, pos: int) -> bool:
+        time_slot = self.time_slots[courier_id][pos]
+        if not time_slot.order_ids:
+            return False
+        group_cost = self.get_group_cost(
+            time_slot.order_ids,
+            self.courier_settings[self.couriers[courier_id].courier_type][
+                "next_delivery_cost"
+            ],
+        )
+        moved = [self.orders[order_id] for order_id in time_slot.order_ids]
+        moved.sort(key=lambda order: order.weight, reverse=True)
+        for order in moved:
+            self.remove_order(order)
+
+        delta, applied = -group_cost, []
+        for order in moved:
+            target = self.find_cheapest_group(
+                order=order, excluded=(courier_id, pos)
+            )
+            if target is None:
+                break
+            target_delta, target_courier_id, target_pos = target
+            self.add_order(order, target_courier_id, target_pos)
+            applied.append(order)
+            delta += target_delta
+
+        if len(applied) == len(moved) and delta < -COST_EPSILON:
+            return True
+
+        for order in applied:
+            self.remove_order(order)
+        for order in moved:
+            self.add_order(order, courier_id, pos)
+        return False
+
+    def find_cheapest_group(
+        self, order, excluded: tuple[int, int]
+    ) -> Optional[tuple[float, int, int]]:
+        best = None
+        for courier in self.region_couriers.get(order.regions, {}).values():
+            settings = self.courier_settings[courier.courier_type]
+            if (
+                order.weight > settings["max_weight"]
+                or self.available_slots[courier.id] <= 0
+            ):
+                continue
+            slot_index = self.slot_indexes[courier.id]
+            for pos in slot_index.get_window_positions(
+                order.delivery_intervals
+            ):
+                time_slot = self.time_slots[courier.id][pos]
+                if (
+                    not time_slot.order_ids
+                    or (courier.id, pos) == excluded
+                    or slot_index.find_in_range(
+                        lo=pos, hi=pos + 1, weight=order.weight
+                    )
+                    is None
+                ):
+                    continue
+                delta = self.get_group_cost(
+                    time_slot.order_ids + [order.id],
+                    settings["next_delivery_cost"],
+                ) - self.get_group_cost(
+                    time_slot.order_ids, settings["next_delivery_cost"]
+                )
+                if best is None or delta < best[0]:
+                    best = (delta, courier.id, pos)
+        return best
@@ -0,0 +1,16 @@
+from services.assignment.base import AssignmentEngine
+from services.assignment.cost_optimal import CostOptimalEngine
+from services.assignment.greedy import GreedyEngine
+
+ENGINES = {
+    "greedy": GreedyEngine,
+    "cost": CostOptimalEngine,
+}
+
+
+def get_engine(name: str, time_budget: float = 1) -> AssignmentEngine:
+    try:
+        engine_class = ENGINES[name]
+    except KeyError:
+        raise ValueError(f"Unknown assignment engine: {name}")
+    return engine_class(time_budget=time_budget)
@@ -0,0 +1,133 @@
+from datetime import datetime
+from typing import Any, Optional
+
+from models import TimeIntervals
+from services.assignment.base import AssignmentEngine
+from services.assignment.slot_index import SlotIndex
+
+
+class GreedyEngine(AssignmentEngine):
+    def assign(
+        self,
+        couriers: list,
+        orders: list,
+        date: datetime,
+        taken_slots: Optional[dict] = None,
+        scheduled_slots: Optional[dict] = None,
+    ) -> dict:
+        self.start(
+            couriers=couriers,
+            date=date,
+            taken_slots=taken_slots,
+            scheduled_slots=scheduled_slots,
+        )
+        for order in self.sort_orders(orders):
+            self.place_order(order)
+        return self.time_slots
+
+    def start(
+        self,
+        couriers: list,
+        date: datetime,
+        taken_slots: Optional[dict] = None,
+        scheduled_slots: Optional[dict] = None,
+    ) -> None:
+        self.time_slots, self.available_slots = self.get_time_slots(
+            couriers=couriers, date=date, taken_slots=taken_slots
+        )
+        if scheduled_slots:
+            self.fill_time_slots(
+                time_slots=self.time_slots,
+                available_slots=self.available_slots,
+                scheduled_slots=scheduled_slots,
+            )
+
+        self.slot_indexes = self.get_slot_indexes(
+            couriers=couriers, time_slots=self.time_slots
+        )
+
+        self.region_couriers = self.get_region_couriers(
+            couriers=couriers, available_slots=self.available_slots
+        )
+
+    def place_order(self, order) -> Optional[tuple[Any, int]]:
+        candidates = self.region_couriers.get(order.regions)
+        if not candidates:
+            return None
+
+        for courier in candidates.values():
+            settings = self.courier_settings[courier.courier_type]
+
+            if order.weight > settings["max_weight"]:
+                continue
+
+            timeslot_id = self.get_timeslot_id(
+                order_delivery_hours=order.delivery_intervals,
+                slot_index=self.slot_indexes[courier.id],
+                weight=order.weight,
+            )
+
+            if timeslot_id is None:
+                continue
+
+            time_slot = self.time_slots[courier.id][timeslot_id]
+            time_slot.order_ids.append(order.id)
+            time_slot.weight += order.weight
+
+            time_slot.cost += (
+                order.cost
+                if len(time_slot.order_ids) == 1
+                else order.cost * settings["next_delivery_cost"]
+            )
+            self.slot_indexes[courier.id].update(timeslot_id)
+            self.available_slots[courier.id] -= 1
+            if self.available_slots[courier.id] <= 0:
+                self.drop_courier(
+                    region_couriers=self.region_couriers,
+                    courier=courier,
+                    max_regions=settings["max_regions"],
+                )
+            return courier.id, timeslot_id
+
+        return None
+
+    def get_region_couriers(
+        self, couriers, available_slots
+    ) -> dict[int, dict[int, Any]]:
+        region_couriers = {}
+        for courier in couriers:
+            if available_slots[courier.id] <= 0:
+                continue
+            settings = self.courier_settings[courier.courier_type]
+            for region in courier.regions[: settings["max_regions"]]:
+                region_couriers.setdefault(region, {})[courier.id] = courier
+        return region_couriers
+
+    @staticmethod
+    def drop_courier(
+        region_couriers: dict[int, dict[int, Any]], courier, max_regions: int
+    ) -> None:
+        for region in courier.regions[:max_regions]:
+            candidates = region_couriers.get(region)
+            if candidates is not None:
+                candidates.pop(courier.id, None)
+
+    def get_slot_indexes(self, couriers, time_slots) -> dict[Any, SlotIndex]:
+        slot_indexes = {}
+        for courier in couriers:
+            settings = self.courier_settings[courier.courier_type]
+            slot_indexes[courier.id] = SlotIndex(
+                time_slots=time_slots[courier.id],
+                slot_time=self.get_slot_time(settings),
+                max_orders=settings["max_orders"],
+                max_weight=settings["max_weight"],
+            )
+        return slot_indexes
+
+    @staticmethod
+    def get_timeslot_id(
+        order_delivery_hours: TimeIntervals,
+        slot_index: SlotIndex,
+        weight: float,
+    ) -> Optional[int]:
+        return slot_index.find(intervals=order_delivery_hours, weight=weight)
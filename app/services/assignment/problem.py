@@ -0,0 +1,68 @@
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from models import CourierType, TimeIntervals
+
+
+class CourierRecord(NamedTuple):
+    id: int
+    courier_type: CourierType
+    regions: tuple[int, ...]
+    working_intervals: TimeIntervals
+
+
+class OrderRecord(NamedTuple):
+    id: int
+    weight: float
+    regions: int
+    delivery_intervals: TimeIntervals
+    cost: float
+
+
+class AssignmentProblem(NamedTuple):
+    couriers: tuple[CourierRecord, ...]
+    orders: tuple[OrderRecord, ...]
+    date: datetime
+    # Start minutes per courier of slots that already hold orders.
+    taken_slots: Optional[dict[int, list[int]]] = None
+
+    @classmethod
+    def from_models(
+        cls,
+        couriers: list,
+        orders: list,
+        date: datetime,
+        taken_slots: Optional[dict[int, list[int]]] = None,
+    ) -> "AssignmentProblem":
+        return cls(
+            couriers=tuple(
+                CourierRecord(
+                    id=courier.id,
+                    courier_type=courier.courier_type,
+                    regions=tuple(courier.regions),
+                    working_intervals=courier.working_intervals,
+                )
+                for courier in couriers
+            ),
+            orders=tuple(
+                OrderRecord(
+                    id=order.id,
+                    weight=order.weight,
+                    regions=order.regions,
+                    delivery_intervals=order.delivery_intervals,
+                    cost=order.cost,
+                )
+                for order in orders
+            ),
+            date=date,
+            taken_slots=taken_slots,
+        )
+
+
+def solve(engine, problem: AssignmentProblem) -> dict:
+    return engine.assign(
+        couriers=problem.couriers,
+        orders=problem.orders,
+        date=problem.date,
+        taken_slots=problem.taken_slots,
+    )
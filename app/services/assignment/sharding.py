@@ -0,0 +1,103 @@
+import heapq
+
+from core.constants import COURIER_SETTINGS
+from services.assignment.problem import AssignmentProblem
+
+
+def find_root(parents: dict[int, int], region: int) -> int:
+    root = region
+    while parents[root] != root:
+        root = parents[root]
+    while parents[region] != root:
+        parents[region], region = root, parents[region]
+    return root
+
+
+def get_region_parents(
+    couriers: tuple, courier_settings: dict
+) -> dict[int, int]:
+    parents = {}
+    for courier in couriers:
+        regions = courier.regions[
+            : courier_settings[courier.courier_type]["max_regions"]
+        ]
+        for region in regions:
+            parents.setdefault(region, region)
+        for region in regions[1:]:
+            parents[find_root(parents, region)] = find_root(
+                parents, regions[0]
+            )
+    return parents
+
+
+def pack_components(
+    component_orders: dict[int, int], shards_count: int
+) -> dict[int, int]:
+    shards = [(0, shard) for shard in range(shards_count)]
+    component_shards = {}
+    for root, orders_count in sorted(
+        component_orders.items(), key=lambda item: item[1], reverse=True
+    ):
+        shard_orders, shard = heapq.heappop(shards)
+        component_shards[root] = shard
+        heapq.heappush(shards, (shard_orders + orders_count, shard))
+    return component_shards
+
+
+def split_problem(
+    problem: AssignmentProblem,
+    shards_count: int,
+    courier_settings: dict = COURIER_SETTINGS,
+) -> list[AssignmentProblem]:
+    """Split a day into independent problems of similar size.
+
+    Orders can only go to couriers whose first ``max_regions`` regions
+    contain the order's region, so the connected components of the
+    region graph linked by couriers never share an order or a courier.
+    Components are packed into at most ``shards_count`` shards by order
+    count; couriers and orders keep their original order in each shard,
+    and taken slots follow their courier.
+    """
+    parents = get_region_parents(
+        couriers=problem.couriers, courier_settings=courier_settings
+    )
+
+    component_orders = {}
+    for order in problem.orders:
+        if order.regions in parents:
+            root = find_root(parents, order.regions)
+            component_orders[root] = component_orders.get(root, 0) + 1
+
+    shards_count = max(shards_count, 1)
+    component_shards = pack_components(
+        component_orders=component_orders, shards_count=shards_count
+    )
+
+    shard_couriers = [[] for _ in range(shards_count)]
+    shard_orders = [[] for _ in range(shards_count)]
+    for courier in problem.couriers:
+        if not courier.regions:
+            continue
+        shard = component_shards.get(find_root(parents, courier.regions[0]))
+        if shard is not None:
+            shard_couriers[shard].append(courier)
+    for order in problem.orders:
+        if order.regions in parents:
+            shard = component_shards[find_root(parents, order.regions)]
+            shard_orders[shard].append(order)
+
+    taken_slots = problem.taken_slots or {}
+    return [
+        AssignmentProblem(
+            couriers=tuple(couriers),
+            orders=tuple(orders),
+            date=problem.date,
+            taken_slots={
+                courier.id: taken_slots[courier.id]
+                for courier in couriers
+                if courier.id in taken_slots
+            },
+        )
+        for couriers, orders in zip(shard_couriers, shard_orders)
+        if orders
+    ]
@@ -0,0 +1,135 @@
+from typing import Iterator, Optional
+
+from models import TimeIntervals, TimeSlot
+
+MINUTES_PER_DAY = 24 * 60
+
+
+class SlotIndex:
+    """First-fit slot lookup for one courier.
+
+    Slots come in runs of equally spaced start times, so a delivery window
+    covers a contiguous range of every run. A min segment tree over slot
+    weights (full slots count as infinity) finds the leftmost fitting slot
+    of such a range in logarithmic time.
+    """
+
+    def __init__(
+        self,
+        time_slots: list[TimeSlot],
+        slot_time: int,
+        max_orders: int,
+        max_weight: float,
+    ):
+        self.time_slots = time_slots
+        self.max_orders = max_orders
+        self.max_weight = max_weight
+        self.runs = self.get_runs(time_slots=time_slots, slot_time=slot_time)
+        self.slot_time = slot_time
+        self.size = 1
+        while self.size < len(time_slots):
+            self.size <<= 1
+        self.tree = [float("inf")] * (2 * self.size)
+        for pos in range(len(time_slots)):
+            self.tree[self.size + pos] = self.get_slot_weight(pos)
+        for node in range(self.size - 1, 0, -1):
+            self.tree[node] = min(self.tree[2 * node], self.tree[2 * node + 1])
+
+    @staticmethod
+    def get_runs(
+        time_slots: list[TimeSlot], slot_time: int
+    ) -> list[tuple[int, int, int]]:
+        runs = []
+        for pos, time_slot in enumerate(time_slots):
+            if (
+                pos > 0
+                and time_slot.start_minute - time_slots[pos - 1].start_minute
+                == slot_time
+            ):
+                first_pos, first_minute, count = runs[-1]
+                runs[-1] = (first_pos, first_minute, count + 1)
+            else:
+                runs.append((pos, time_slot.start_minute % MINUTES_PER_DAY, 1))
+        return runs
+
+    def get_slot_weight(self, pos: int) -> float:
+        time_slot = self.time_slots[pos]
+        if len(time_slot.order_ids) >= self.max_orders:
+            return float("inf")
+        return time_slot.weight
+
+    def update(self, pos: int) -> None:
+        node = self.size + pos
+        self.tree[node] = self.get_slot_weight(pos)
+        node >>= 1
+        while node:
+            self.tree[node] = min(self.tree[2 * node], self.tree[2 * node + 1])
+            node >>= 1
+
+    def find(self, intervals: TimeIntervals, weight: float) -> Optional[int]:
+        if self.tree[1] + weight > self.max_weight:
+            return None
+        for first_pos, first_minute, count in self.runs:
+            found = None
+            for lo, hi in self.get_run_ranges(
+                first_minute=first_minute, count=count, intervals=intervals
+            ):
+                if found is not None:
+                    hi = min(hi, found - first_pos)
+                if lo >= hi:
+                    continue
+                pos = self.find_in_range(
+                    lo=first_pos + lo, hi=first_pos + hi, weight=weight
+                )
+                if pos is not None:
+                    found = pos
+            if found is not None:
+                return found
+        return None
+
+    def get_window_positions(self, intervals: TimeIntervals) -> list[int]:
+        positions = set()
+        for first_pos, first_minute, count in self.runs:
+            for lo, hi in self.get_run_ranges(
+                first_minute=first_minute, count=count, intervals=intervals
+            ):
+                positions.update(range(first_pos + lo, first_pos + hi))
+        return sorted(positions)
+
+    def get_run_ranges(
+        self, first_minute: int, count: int, intervals: TimeIntervals
+    ) -> Iterator[tuple[int, int]]:
+        last_minute = first_minute + (count - 1) * self.slot_time
+        for start, end in intervals.ranges:
+            start, end = max(start, 0), min(end, MINUTES_PER_DAY)
+            if start >= end:
+                continue
+            for day_shift in range(0, last_minute + 1, MINUTES_PER_DAY):
+                lo = -((first_minute - start - day_shift) // self.slot_time)
+                hi = -((first_minute - end - day_shift) // self.slot_time)
+                lo, hi = max(lo, 0), min(hi, count)
+                if lo < hi:
+                    yield lo, hi
+
+    def find_in_range(self, lo: int, hi: int, weight: float) -> Optional[int]:
+        tree, max_weight = self.tree, self.max_weight
+        left_nodes, right_nodes = [], []
+        lo += self.size
+        hi += self.size
+        while lo < hi:
+            if lo & 1:
+                left_nodes.append(lo)
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                right_nodes.append(hi)
+            lo >>= 1
+            hi >>= 1
+        for node in left_nodes + right_nodes[::-1]:
+            if tree[node] + weight <= max_weight:
+                while node < self.size:
+                    node <<= 1
+                    if tree[node] + weight > max_weight:
+                        node += 1
+                return node - self.size
+        return None
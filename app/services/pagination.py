@@ -0,0 +1,25 @@
+import base64
+import binascii
+from typing import Optional
+
+
+def encode_cursor(last_id: int) -> str:
+    return base64.urlsafe_b64encode(f"id:{last_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    if not cursor:
+        return 0
+    try:
+        prefix, _, last_id = (
+            base64.urlsafe_b64decode(cursor.encode()).decode().partition(":")
+        )
+    except (binascii.Error, UnicodeError) as error:
+        raise ValueError("Invalid cursor.") from error
+    if prefix != "id" or not last_id.isdigit():
+        raise ValueError("Invalid cursor.")
+    return int(last_id)
+
+
+def get_next_cursor(ids: list[int], limit: int) -> Optional[str]:
+    return encode_cursor(ids[limit - 1]) if 0 < limit < len(ids) else None
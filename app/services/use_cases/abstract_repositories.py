@@ -1,18 +1,47 @@
 from abc import ABC, abstractmethod
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from typing import AsyncContextManager, AsyncIterator, Iterable, Optional
 
 from models import (
+    CompleteInfo,
     CompleteOrderList,
     CourierModel,
     CouriersList,
     CouriersListResponse,
     OrderModel,
     OrdersList,
+    TimeSlot,
 )
 
 
 class LavkaAbstractRepository(ABC):
+    @staticmethod
+    def get_completions(
+        complete_info: list[CompleteInfo],
+        orders: dict[int, tuple[Optional[int], Optional[datetime]]],
+        courier_ids: set[int],
+    ) -> Optional[dict[int, tuple[int, datetime]]]:
+        completions = {}
+        for info in complete_info:
+            if info.order_id not in orders:
+                return None
+            complete_time = info.complete_time.replace(tzinfo=None)
+            courier_id, completed_time = completions.get(
+                info.order_id, orders[info.order_id]
+            )
+            if courier_id is None:
+                if info.courier_id in courier_ids:
+                    completions[info.order_id] = (
+                        info.courier_id,
+                        complete_time,
+                    )
+            elif (
+                courier_id != info.courier_id
+                or completed_time != complete_time
+            ):
+                return None
+        return completions
+
     @abstractmethod
     async def create_couriers(
         self, *, couriers_model: CouriersList
@@ -29,9 +58,14 @@ class LavkaAbstractRepository(ABC):
     ) -> CouriersListResponse:
         pass
 
-    @staticmethod
     @abstractmethod
-    async def get_all_couriers() -> list[CourierModel]:
+    async def get_couriers_after(
+        self, after_id: int, limit: int
+    ) -> list[CourierModel]:
+        pass
+
+    @abstractmethod
+    async def get_all_couriers(self) -> list[CourierModel]:
         pass
 
     @abstractmethod
@@ -48,6 +82,12 @@ class LavkaAbstractRepository(ABC):
     async def get_orders(self, offset: int, limit: int) -> list[OrderModel]:
         pass
 
+    @abstractmethod
+    async def get_orders_after(
+        self, after_id: int, limit: int
+    ) -> list[OrderModel]:
+        pass
+
     @abstractmethod
     async def complete_orders(self, complete_orders_model: CompleteOrderList):
         pass
@@ -58,18 +98,87 @@ class LavkaAbstractRepository(ABC):
     ):
         pass
 
+    @abstractmethod
+    async def get_cost_sums_and_order_counts(
+        self,
+        courier_ids: Optional[list[int]],
+        start_date: datetime,
+        end_date: datetime,
+    ) -> dict[int, tuple[float, int]]:
+        pass
+
+    @abstractmethod
+    def stream_couriers_totals(
+        self,
+        courier_ids: Optional[list[int]],
+        start_date: datetime,
+        end_date: datetime,
+        chunk_size: int,
+    ) -> AsyncIterator[list[tuple[CourierModel, Optional[float], int]]]:
+        pass
+
     @abstractmethod
     async def get_orders_to_assign(self, date: datetime) -> list[OrderModel]:
         pass
 
     @abstractmethod
-    async def save_schedule(self, time_slots: dict, date: datetime):
+    async def get_orders_to_assign_by_date(
+        self, start_date: datetime, end_date: datetime
+    ) -> dict[date, list[OrderModel]]:
+        pass
+
+    @abstractmethod
+    def stream_orders_to_assign(
+        self, date: datetime, chunk_size: int
+    ) -> AsyncIterator[list[OrderModel]]:
+        pass
+
+    @abstractmethod
+    async def get_unscheduled_orders(self, date: datetime) -> list[OrderModel]:
+        pass
+
+    @abstractmethod
+    def schedule_transaction(self, date: datetime) -> AsyncContextManager:
+        pass
+
+    @abstractmethod
+    async def get_scheduled_slots(
+        self, date: datetime, completed_only: bool = False
+    ) -> dict[int, list[TimeSlot]]:
+        pass
+
+    @abstractmethod
+    async def save_schedule_delta(
+        self, time_slots: dict, date: datetime, order_ids: Iterable[int]
+    ) -> None:
+        pass
+
+    @abstractmethod
+    async def save_schedule(self, time_slots: dict, date: datetime) -> None:
+        pass
+
+    @abstractmethod
+    async def save_schedules(self, schedules: dict[datetime, dict]) -> None:
+        pass
+
+    @abstractmethod
+    async def replace_schedule(self, time_slots: dict, date: datetime) -> None:
         pass
 
     @abstractmethod
     async def get_count_of_schedule(self, date: datetime) -> int:
         pass
 
+    @abstractmethod
+    async def get_scheduled_dates(
+        self, start_date: datetime, end_date: datetime
+    ) -> set[date]:
+        pass
+
     @abstractmethod
     async def get_couriers_assignments(self, courier_id: int, date: datetime):
         pass
+
+    @abstractmethod
+    async def release_connection(self) -> None:
+        pass
@@ -1,12 +1,20 @@
 from datetime import datetime
+from typing import AsyncIterator, Optional
 
-from core.constants import RATING_COEFFICIENTS, SALARY_COEFFICIENTS
+from core.constants import (
+    META_INFO_CHUNK_SIZE,
+    RATING_COEFFICIENTS,
+    SALARY_COEFFICIENTS,
+)
 from models import (
     CourierMetaInfo,
     CourierModel,
     CouriersList,
     CouriersListResponse,
+    CouriersPageResponse,
+    TimeIntervals,
 )
+from services.pagination import decode_cursor, get_next_cursor
 from services.use_cases.abstract_repositories import LavkaAbstractRepository
 
 
@@ -29,6 +37,20 @@ class CourierService:
     ) -> CouriersListResponse:
         return await self.repository.get_couriers(offset=offset, limit=limit)
 
+    async def get_couriers_page(
+        self, cursor: str, limit: int
+    ) -> CouriersPageResponse:
+        couriers = await self.repository.get_couriers_after(
+            after_id=decode_cursor(cursor), limit=limit + 1
+        )
+        return CouriersPageResponse(
+            couriers=couriers[:limit],
+            limit=limit,
+            next_cursor=get_next_cursor(
+                [courier.id for courier in couriers], limit
+            ),
+        )
+
     async def get_courier_meta_info(
         self, *, courier_id: int, start_date: datetime, end_date: datetime
     ):
@@ -39,6 +61,39 @@ class CourierService:
         ) = await self.repository.get_cost_sum_and_order_count(
             courier_id=courier_id, start_date=start_date, end_date=end_date
         )
+        return self.get_meta_info(
+            courier=courier,
+            sum_of_orders=sum_of_orders,
+            completed_orders=completed_orders,
+        )
+
+    async def get_couriers_meta_info(
+        self,
+        *,
+        courier_ids: Optional[list[int]],
+        start_date: datetime,
+        end_date: datetime,
+    ) -> AsyncIterator[CourierMetaInfo]:
+        async for rows in self.repository.stream_couriers_totals(
+            courier_ids=courier_ids,
+            start_date=start_date,
+            end_date=end_date,
+            chunk_size=META_INFO_CHUNK_SIZE,
+        ):
+            for courier, sum_of_orders, completed_orders in rows:
+                yield self.get_meta_info(
+                    courier=courier,
+                    sum_of_orders=sum_of_orders,
+                    completed_orders=completed_orders,
+                )
+
+    @classmethod
+    def get_meta_info(
+        cls,
+        courier: CourierModel,
+        sum_of_orders: Optional[float],
+        completed_orders: int,
+    ) -> CourierMetaInfo:
         if completed_orders == 0:
             rating = None
             earnings = None
@@ -47,8 +102,8 @@ class CourierService:
                 sum_of_orders * SALARY_COEFFICIENTS[courier.courier_type]
             )
 
-            working_hours = self.get_working_hours(
-                time_ranges=courier.working_hours
+            working_hours = cls.get_working_hours(
+                time_ranges=courier.working_intervals
             )
             rating = (
                 completed_orders
@@ -66,21 +121,10 @@ class CourierService:
         )
 
     @staticmethod
-    def get_working_hours(time_ranges: list) -> float:
-        start_times, end_times = [], []
-        for time_range in time_ranges:
-            start, end = time_range.split("-")
-            start_times.append(datetime.strptime(start, "%H:%M").time())
-            end_times.append(datetime.strptime(end, "%H:%M").time())
-
-        min_start_time = min(start_times)
-        max_end_time = max(end_times)
-
-        start_datetime = datetime.combine(datetime.min, min_start_time)
-        end_datetime = datetime.combine(datetime.min, max_end_time)
-        time_difference = end_datetime - start_datetime
-
-        return time_difference.total_seconds() / 3600
+    def get_working_hours(time_ranges: TimeIntervals) -> float:
+        min_start_minutes = min(start for start, _ in time_ranges.ranges)
+        max_end_minutes = max(end for _, end in time_ranges.ranges)
+        return (max_end_minutes - min_start_minutes) / 60
 
     async def get_couriers_assignments(self, courier_id: int, date: datetime):
         return await self.repository.get_couriers_assignments(
@@ -1,18 +1,46 @@
+import asyncio
+from concurrent.futures import Executor
 from datetime import datetime, timedelta
-from typing import Any, Optional
+from typing import Optional
 
-from core.constants import COURIER_SETTINGS
 from models import (
+    AssignmentSummaryModel,
     CompleteOrderList,
+    CourierScheduleModel,
+    DeliveryScheduleModel,
+    GroupOrderModel,
     OrderModel,
     OrdersList,
+    OrdersPageResponse,
 )
+from services.assignment.engines import get_engine
+from services.assignment.greedy import GreedyEngine
+from services.assignment.problem import AssignmentProblem, solve
+from services.assignment.sharding import split_problem
+from services.pagination import decode_cursor, get_next_cursor
 from services.use_cases.abstract_repositories import LavkaAbstractRepository
 
 
 class OrderService:
-    def __init__(self, repository: LavkaAbstractRepository):
+    def __init__(
+        self,
+        repository: LavkaAbstractRepository,
+        assignment_engine: str = "greedy",
+        assignment_time_budget: float = 1,
+        assignment_executor: Optional[Executor] = None,
+        assignment_workers: int = 0,
+        assignment_stream_chunk_size: int = 5000,
+    ):
         self.repository = repository
+        self.engine = get_engine(
+            assignment_engine, time_budget=assignment_time_budget
+        )
+        self.incremental_engine = GreedyEngine(
+            courier_settings=self.engine.courier_settings
+        )
+        self.executor = assignment_executor
+        self.workers = assignment_workers
+        self.stream_chunk_size = assignment_stream_chunk_size
 
     async def create_orders(
         self, *, orders_model: OrdersList
@@ -25,13 +53,27 @@ class OrderService:
     async def get_orders(self, offset: int, limit: int) -> list[OrderModel]:
         return await self.repository.get_orders(offset=offset, limit=limit)
 
+    async def get_orders_page(
+        self, cursor: str, limit: int
+    ) -> OrdersPageResponse:
+        orders = await self.repository.get_orders_after(
+            after_id=decode_cursor(cursor), limit=limit + 1
+        )
+        return OrdersPageResponse(
+            orders=orders[:limit],
+            limit=limit,
+            next_cursor=get_next_cursor([order.id for order in orders], limit),
+        )
+
     async def complete_orders(self, complete_orders_model: CompleteOrderList):
         return await self.repository.complete_orders(
             complete_orders_model=complete_orders_model
         )
 
-    async def assign_orders(self, date: datetime):
+    async def assign_orders(self, date: datetime, incremental: bool = False):
         if await self.repository.get_count_of_schedule(date=date) > 0:
+            if incremental:
+                return await self.assign_late_orders(date=date)
             return None
 
         couriers = await self.repository.get_all_couriers()
@@ -45,133 +87,268 @@ class OrderService:
         if not orders_to_assign:
             return None
 
-        sorted_orders = sorted(
-            orders_to_assign,
-            key=lambda current_order: current_order.weight,
-            reverse=True,
+        time_slots = await self.solve(
+            AssignmentProblem.from_models(
+                couriers=couriers, orders=orders_to_assign, date=date
+            )
         )
 
-        time_slots, available_slots = self.get_time_slots(
-            couriers=couriers,
-            current_courier_settings=COURIER_SETTINGS,
+        await self.repository.save_schedule(time_slots=time_slots, date=date)
+        schedule = self.get_delivery_schedule(
+            time_slots=time_slots,
+            orders={order.id: order for order in orders_to_assign},
             date=date,
         )
+        return schedule if schedule.couriers else None
 
-        for order in sorted_orders:
-            for courier in couriers:
-                settings = COURIER_SETTINGS[courier.courier_type]
+    async def assign_orders_stream(
+        self, date: datetime
+    ) -> Optional[AssignmentSummaryModel]:
+        if await self.repository.get_count_of_schedule(date=date) > 0:
+            return None
 
-                if (
-                    order.regions
-                    not in courier.regions[: settings["max_regions"]]
-                    or order.weight > settings["max_weight"]
-                    or available_slots[courier.id] <= 0
-                ):
-                    continue
+        couriers = await self.repository.get_all_couriers()
 
-                timeslot_id = self.get_timeslot_id(
-                    order_delivery_hours=order.delivery_hours,
-                    time_slots=time_slots[courier.id],
-                    max_orders=settings["max_orders"],
-                    weight=order.weight,
-                    max_weight=settings["max_weight"],
-                )
+        if not couriers:
+            return None
 
-                if timeslot_id is None:
+        engine = self.incremental_engine
+        engine.start(
+            couriers=AssignmentProblem.from_models(
+                couriers=couriers, orders=[], date=date
+            ).couriers,
+            date=date,
+        )
+        orders_count = 0
+        async for orders in self.repository.stream_orders_to_assign(
+            date=date, chunk_size=self.stream_chunk_size
+        ):
+            orders_count += len(orders)
+            positions, order_ids = {}, []
+            for order in AssignmentProblem.from_models(
+                couriers=[], orders=orders, date=date
+            ).orders:
+                placement = engine.place_order(order)
+                if placement is None:
                     continue
+                courier_id, pos = placement
+                positions.setdefault(courier_id, set()).add(pos)
+                order_ids.append(order.id)
+            if order_ids:
+                await self.repository.save_schedule_delta(
+                    time_slots={
+                        courier_id: [
+                            engine.time_slots[courier_id][pos]
+                            for pos in sorted(courier_positions)
+                        ]
+                        for courier_id, courier_positions in positions.items()
+                    },
+                    date=date,
+                    order_ids=order_ids,
+                )
 
-                time_slot = time_slots[courier.id][timeslot_id]
-                time_slot[1].append(order.id)
-                time_slot[2] += order.weight
+        if not orders_count:
+            return None
 
-                time_slot[3] += (
-                    order.cost
-                    if len(time_slot[1]) == 1
-                    else order.cost * settings["next_delivery_cost"]
-                )
-                available_slots[courier.id] -= 1
-                break
+        return self.get_assignment_summary(
+            date=date, orders_count=orders_count, time_slots=engine.time_slots
+        )
+
+    async def replan_orders(self, date: datetime):
+        couriers = await self.repository.get_all_couriers()
+
+        if not couriers:
+            return None
 
-        return await self.repository.save_schedule(
+        orders_to_assign = await self.repository.get_orders_to_assign(
+            date=date
+        )
+        if not orders_to_assign:
+            return None
+
+        # Completed orders keep their rows, so their slots stay taken.
+        completed_slots = await self.repository.get_scheduled_slots(
+            date=date, completed_only=True
+        )
+        time_slots = await self.solve(
+            AssignmentProblem.from_models(
+                couriers=couriers,
+                orders=orders_to_assign,
+                date=date,
+                taken_slots={
+                    courier_id: [
+                        time_slot.start_minute for time_slot in courier_slots
+                    ]
+                    for courier_id, courier_slots in completed_slots.items()
+                },
+            )
+        )
+
+        await self.repository.replace_schedule(
             time_slots=time_slots, date=date
         )
+        return await self.repository.get_couriers_assignments(
+            courier_id=-1,
+            date=date.replace(hour=0, minute=0, second=0, microsecond=0),
+        )
 
-    def get_time_slots(
-        self, couriers, current_courier_settings, date
-    ) -> tuple[dict[Any, list[Any]], dict[Any, int]]:
-        time_slots = {}
-        available_slots = {}
-        for courier in couriers:
-            time_slots[courier.id] = []
-            available_slots[courier.id] = 0
-            settings = current_courier_settings[courier.courier_type]
-            max_time_slot_time = settings["first_order_time"] + settings[
-                "next_order_time"
-            ] * (settings["max_orders"] - 1)
-            for time_interval in courier.working_hours:
-                duration_minutes = (
-                    self.get_duration_minutes(time_interval)
-                    + max_time_slot_time
-                )
-                start_date = self.get_start_date(
-                    time_interval=time_interval, date=date
-                )
-                while duration_minutes >= max_time_slot_time:
-                    time_slots[courier.id].append(([start_date, [], 0, 0]))
-                    start_date += timedelta(minutes=max_time_slot_time)
-                    available_slots[courier.id] += 1
-                    duration_minutes -= max_time_slot_time
-        return time_slots, available_slots
-
-    def get_timeslot_id(
-        self,
-        order_delivery_hours: list,
-        time_slots: list,
-        max_orders: int,
-        weight: float,
-        max_weight: float,
-    ) -> Optional[int]:
-        return next(
-            (
-                pos
-                for pos, time_slot in enumerate(time_slots)
-                if len(time_slot[1]) < max_orders
-                and time_slot[2] + weight <= max_weight
-                and self.is_time_in_intervals(
-                    time=time_slot[0], intervals=order_delivery_hours
+    async def assign_late_orders(
+        self, date: datetime
+    ) -> Optional[DeliveryScheduleModel]:
+        couriers = await self.repository.get_all_couriers()
+
+        if not couriers:
+            return None
+
+        async with self.repository.schedule_transaction(date=date):
+            late_orders = await self.repository.get_unscheduled_orders(
+                date=date
+            )
+            if not late_orders:
+                return None
+
+            scheduled_slots = await self.repository.get_scheduled_slots(
+                date=date
+            )
+            problem = AssignmentProblem.from_models(
+                couriers=couriers, orders=late_orders, date=date
+            )
+            time_slots = self.incremental_engine.assign(
+                couriers=problem.couriers,
+                orders=problem.orders,
+                date=date,
+                scheduled_slots=scheduled_slots,
+            )
+
+            orders = {order.id: order for order in late_orders}
+            await self.repository.save_schedule_delta(
+                time_slots=time_slots, date=date, order_ids=orders.keys()
+            )
+        return self.get_delivery_schedule(
+            time_slots=time_slots, orders=orders, date=date
+        )
+
+    @staticmethod
+    def get_delivery_schedule(
+        time_slots: dict, orders: dict[int, OrderModel], date: datetime
+    ) -> DeliveryScheduleModel:
+        couriers = []
+        for courier_id in sorted(time_slots):
+            groups = {}
+            for time_slot in time_slots[courier_id]:
+                for group_order_id, order_id in enumerate(time_slot.order_ids):
+                    if order_id in orders:
+                        groups.setdefault(group_order_id, []).append(
+                            orders[order_id]
+                        )
+            if groups:
+                couriers.append(
+                    CourierScheduleModel(
+                        courier_id=courier_id,
+                        orders=[
+                            GroupOrderModel(
+                                group_order_id=group_order_id,
+                                orders=groups[group_order_id],
+                            )
+                            for group_order_id in sorted(groups)
+                        ],
+                    )
                 )
-            ),
-            None,
+        return DeliveryScheduleModel(
+            date=date.date().isoformat(), couriers=couriers
         )
 
-    def is_time_in_intervals(self, time: datetime, intervals: list):
-        time_minutes = time.hour * 60 + time.minute
-        for interval in intervals:
-            start_str, end_str = interval.split("-")
-            start_minutes = self.time_to_minutes(start_str)
-            end_minutes = self.time_to_minutes(end_str)
-            if start_minutes <= time_minutes < end_minutes:
-                return True
-        return False
+    async def assign_orders_batch(
+        self, start_date: datetime, end_date: datetime
+    ) -> Optional[list[AssignmentSummaryModel]]:
+        couriers = await self.repository.get_all_couriers()
 
-    @staticmethod
-    def time_to_minutes(time_str):
-        hours, minutes = map(int, time_str.split(":"))
-        return hours * 60 + minutes
+        if not couriers:
+            return None
 
-    @staticmethod
-    def get_start_date(time_interval: str, date: datetime) -> datetime:
-        start_time_str, end_time_str = time_interval.split("-")
-        start_hours, start_minutes = map(int, start_time_str.split(":"))
-        start_time_delta = timedelta(hours=start_hours, minutes=start_minutes)
-        start_of_day = date.replace(hour=0, minute=0, second=0, microsecond=0)
-        return start_of_day + start_time_delta
+        scheduled_dates = await self.repository.get_scheduled_dates(
+            start_date=start_date, end_date=end_date
+        )
+        orders_by_date = await self.repository.get_orders_to_assign_by_date(
+            start_date=start_date, end_date=end_date
+        )
+        dates = [
+            start_date + timedelta(days=day)
+            for day in range((end_date - start_date).days + 1)
+        ]
+        problems = {
+            date: AssignmentProblem.from_models(
+                couriers=couriers,
+                orders=orders_by_date[date.date()],
+                date=date,
+            )
+            for date in dates
+            if date.date() not in scheduled_dates
+            and orders_by_date.get(date.date())
+        }
+
+        schedules = dict(
+            zip(
+                problems,
+                await asyncio.gather(
+                    *(self.solve(problem) for problem in problems.values())
+                ),
+            )
+        )
+        if schedules:
+            await self.repository.save_schedules(schedules=schedules)
+
+        return [
+            self.get_assignment_summary(
+                date=date,
+                orders_count=len(orders_by_date.get(date.date(), [])),
+                time_slots=schedules.get(date),
+            )
+            for date in dates
+        ]
 
     @staticmethod
-    def get_duration_minutes(time_interval: str) -> int:
-        start_time_str, end_time_str = time_interval.split("-")
-        start_hours, start_minutes = map(int, start_time_str.split(":"))
-        end_hours, end_minutes = map(int, end_time_str.split(":"))
-        start_minutes_total = start_hours * 60 + start_minutes
-        end_minutes_total = end_hours * 60 + end_minutes
-        return end_minutes_total - start_minutes_total
+    def get_assignment_summary(
+        date: datetime, orders_count: int, time_slots: Optional[dict]
+    ) -> AssignmentSummaryModel:
+        if time_slots is None:
+            return AssignmentSummaryModel(
+                date=date.date().isoformat(),
+                orders_count=orders_count,
+                assigned_count=0,
+                couriers_count=0,
+                planned=False,
+            )
+        assigned_counts = [
+            sum(len(time_slot.order_ids) for time_slot in courier_slots)
+            for courier_slots in time_slots.values()
+        ]
+        return AssignmentSummaryModel(
+            date=date.date().isoformat(),
+            orders_count=orders_count,
+            assigned_count=sum(assigned_counts),
+            couriers_count=sum(1 for count in assigned_counts if count),
+            planned=True,
+        )
+
+    async def solve(self, problem: AssignmentProblem) -> dict:
+        # Solving does not touch the database, so the request's connection
+        # goes back to the pool instead of idling until the schedule is saved.
+        await self.repository.release_connection()
+        if self.executor is None:
+            return solve(self.engine, problem)
+        loop = asyncio.get_running_loop()
+        shards = await asyncio.gather(
+            *(
+                loop.run_in_executor(self.executor, solve, self.engine, shard)
+                for shard in split_problem(
+                    problem,
+                    shards_count=self.workers,
+                    courier_settings=self.engine.courier_settings,
+                )
+            )
+        )
+        time_slots = {}
+        for shard_time_slots in shards:
+            time_slots.update(shard_time_slots)
+        return time_slots
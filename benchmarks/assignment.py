@@ -0,0 +1,233 @@
+import argparse
+import asyncio
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "app"))
+
+from infrastructure.memory_repository import (  # noqa: E402
+    LavkaMemoryRepository,
+)
+from models import (  # noqa: E402
+    CourierModel,
+    CouriersList,
+    CourierType,
+    OrderModel,
+    OrdersList,
+)
+from services.assignment.engines import ENGINES  # noqa: E402
+from services.assignment.greedy import GreedyEngine  # noqa: E402
+from services.assignment.problem import AssignmentProblem  # noqa: E402
+from services.use_cases.order_service import OrderService  # noqa: E402
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+ORDERS_PER_COURIER = 10
+ORDERS_PER_REGION = 500
+TIMESLOT_ID_LOOKUPS = 10_000
+
+
+def minutes_to_time(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def random_hours(rnd: random.Random) -> list[str]:
+    hours = []
+    for _ in range(rnd.randint(1, 3)):
+        start = rnd.randint(0, 22 * 60)
+        end = min(start + rnd.randint(30, 10 * 60), 24 * 60)
+        hours.append(f"{minutes_to_time(start)}-{minutes_to_time(end)}")
+    return hours
+
+
+def generate_day(
+    seed: int, orders_count: int
+) -> tuple[list[CourierModel], list[OrderModel]]:
+    rnd = random.Random(seed)
+    couriers_count = max(orders_count // ORDERS_PER_COURIER, 1)
+    regions_count = max(orders_count // ORDERS_PER_REGION, 4)
+    courier_types = list(CourierType)
+    couriers = [
+        CourierModel(
+            courier_id=courier_id,
+            courier_type=rnd.choice(courier_types),
+            regions=rnd.sample(range(1, regions_count + 1), rnd.randint(1, 4)),
+            working_hours=random_hours(rnd),
+        )
+        for courier_id in range(1, couriers_count + 1)
+    ]
+    orders = [
+        OrderModel(
+            order_id=order_id,
+            weight=round(rnd.uniform(0.1, 45), 2),
+            regions=rnd.randint(1, regions_count),
+            delivery_hours=random_hours(rnd),
+            cost=rnd.randint(50, 500),
+        )
+        for order_id in range(1, orders_count + 1)
+    ]
+    return couriers, orders
+
+
+async def create_repository(
+    couriers: list, orders: list
+) -> LavkaMemoryRepository:
+    repository = LavkaMemoryRepository()
+    await repository.create_couriers(
+        couriers_model=CouriersList(couriers=couriers)
+    )
+    await repository.create_orders(orders_model=OrdersList(orders=orders))
+    return repository
+
+
+async def run_assign(
+    couriers: list, orders: list, engine: str
+) -> tuple[float, int]:
+    repository = await create_repository(couriers=couriers, orders=orders)
+    service = OrderService(repository=repository, assignment_engine=engine)
+    date = datetime.now()
+    start = time.perf_counter()
+    await service.assign_orders(date=date)
+    wall_seconds = time.perf_counter() - start
+    return wall_seconds, await repository.get_count_of_schedule(date=date)
+
+
+def measure_get_time_slots(couriers: list, date: datetime) -> float:
+    problem = AssignmentProblem.from_models(
+        couriers=couriers, orders=[], date=date
+    )
+    start = time.perf_counter()
+    GreedyEngine().get_time_slots(couriers=problem.couriers, date=date)
+    return time.perf_counter() - start
+
+
+def measure_get_timeslot_id(
+    couriers: list, orders: list, date: datetime, seed: int
+) -> float:
+    rnd = random.Random(seed)
+    engine = GreedyEngine()
+    problem = AssignmentProblem.from_models(
+        couriers=couriers, orders=orders, date=date
+    )
+    time_slots, _ = engine.get_time_slots(couriers=problem.couriers, date=date)
+    slot_indexes = engine.get_slot_indexes(
+        couriers=problem.couriers, time_slots=time_slots
+    )
+    lookups = [
+        (
+            rnd.choice(problem.orders),
+            slot_indexes[rnd.choice(problem.couriers).id],
+        )
+        for _ in range(TIMESLOT_ID_LOOKUPS)
+    ]
+    start = time.perf_counter()
+    for order, slot_index in lookups:
+        engine.get_timeslot_id(
+            order_delivery_hours=order.delivery_intervals,
+            slot_index=slot_index,
+            weight=order.weight,
+        )
+    return (time.perf_counter() - start) / TIMESLOT_ID_LOOKUPS
+
+
+def run_benchmark(
+    orders_count: int, seed: int, engine: str, trace_memory: bool
+) -> dict:
+    couriers, orders = generate_day(seed=seed, orders_count=orders_count)
+
+    date = datetime.now()
+
+    wall_seconds, assigned_count = asyncio.run(
+        run_assign(couriers=couriers, orders=orders, engine=engine)
+    )
+    peak_memory_mb = None
+    if trace_memory:
+        tracemalloc.start()
+        asyncio.run(
+            run_assign(couriers=couriers, orders=orders, engine=engine)
+        )
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_memory_mb = round(peak / 2**20, 2)
+
+    return {
+        "orders": orders_count,
+        "couriers": len(couriers),
+        "engine": engine,
+        "wall_seconds": round(wall_seconds, 4),
+        "get_time_slots_seconds": round(
+            measure_get_time_slots(couriers, date), 4
+        ),
+        "get_timeslot_id_us": round(
+            measure_get_timeslot_id(couriers, orders, date, seed) * 1e6, 3
+        ),
+        "peak_memory_mb": peak_memory_mb,
+        "assigned_ratio": round(assigned_count / orders_count, 4),
+    }
+
+
+def get_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark order assignment on synthetic days."
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES)
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="greedy")
+    parser.add_argument("--output", default="benchmark.json")
+    parser.add_argument(
+        "--skip-memory",
+        action="store_true",
+        help="do not repeat each run under tracemalloc",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    results = []
+    for orders_count in args.sizes:
+        result = run_benchmark(
+            orders_count=orders_count,
+            seed=args.seed,
+            engine=args.engine,
+            trace_memory=not args.skip_memory,
+        )
+        print(json.dumps(result))
+        results.append(result)
+
+    with open(args.output, "w") as file:
+        json.dump(
+            {
+                "commit": get_commit(),
+                "python": platform.python_version(),
+                "seed": args.seed,
+                "results": results,
+            },
+            file,
+            indent=2,
+        )
+
+
+if __name__ == "__main__":
+    main()
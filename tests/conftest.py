@@ -1,6 +1,9 @@
 import asyncio
+import json
 import os
+import sys
 from dataclasses import dataclass
+from pathlib import Path
 
 import aiohttp
 import pytest
@@ -72,6 +75,44 @@ async def setup_database():
             await session.commit()
 
 
+@pytest.fixture
+def execute_sql():
+    async def inner(*statements: str) -> list:
+        engine = create_async_engine(
+            f"postgresql+asyncpg://{user}:{password}@{db_host}:{db_port}/{db}"
+        )
+        async with engine.begin() as connection:
+            results = [
+                (await connection.execute(text(statement))).all()
+                if statement.lstrip().upper().startswith("SELECT")
+                else None
+                for statement in statements
+            ]
+        await engine.dispose()
+        return results
+
+    return inner
+
+
+@pytest.fixture
+def postgres_repository():
+    """Repository of the application, for paths the API cannot reach."""
+    os.environ.setdefault("PROJECT_NAME", "lavka")
+    os.environ.setdefault(
+        "STORAGE_URL",
+        f"postgresql+asyncpg://{user}:{password}@{db_host}:{db_port}/{db}",
+    )
+    app_path = str(Path(__file__).resolve().parents[1] / "app")
+    if app_path not in sys.path:
+        sys.path.insert(0, app_path)
+    from infrastructure.postgres_repository import LavkaPostgresRepository
+    from infrastructure.roster_cache import RosterCache
+
+    return LavkaPostgresRepository(
+        config=os.environ["STORAGE_URL"], roster_cache=RosterCache()
+    )
+
+
 @pytest.fixture(autouse=True)
 async def create_orders(make_post_request):
     await make_post_request(
@@ -178,8 +219,15 @@ def make_post_request(session):
         url = f"{service_api_url}{endpoint}"
         async with aiohttp.ClientSession(headers=headers) as session:
             async with session.post(url, json=params) as response:
+                if response.content_type == "application/x-ndjson":
+                    body = [
+                        json.loads(line)
+                        for line in (await response.text()).splitlines()
+                    ]
+                else:
+                    body = await response.json()
                 return HTTPResponse(
-                    body=await response.json(),
+                    body=body,
                     headers=response.headers,
                     status=response.status,
                 )
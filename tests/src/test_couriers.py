@@ -87,6 +87,68 @@ async def test_get_existing_courier(
     }
 
 
+async def test_get_courier_is_served_from_roster_cache(
+    make_get_request, make_post_request, setup_database, create_couriers
+):
+    await setup_database
+    await create_couriers
+    await make_post_request("/orders/assign")
+    stats = await make_get_request("/stats/roster-cache")
+    await make_get_request("/couriers/1")
+    response = await make_get_request("/stats/roster-cache")
+    assert response.status == HTTPStatus.OK
+    assert response.body["hits"] == stats.body["hits"] + 1
+    assert response.body["misses"] == stats.body["misses"]
+
+
+async def test_get_courier_miss_reloads_roster_cache(
+    make_get_request, setup_database, create_couriers
+):
+    await setup_database
+    await create_couriers
+    stats = await make_get_request("/stats/roster-cache")
+    await make_get_request("/couriers/1")
+    missed = await make_get_request("/stats/roster-cache")
+    response = await make_get_request("/couriers/2")
+    assert response.status == HTTPStatus.OK
+    assert response.body["courier_type"] == "BIKE"
+    served = await make_get_request("/stats/roster-cache")
+    assert missed.body["misses"] == stats.body["misses"] + 1
+    assert served.body["hits"] == missed.body["hits"] + 1
+    assert served.body["misses"] == missed.body["misses"]
+
+
+async def test_get_courier_is_not_served_from_stale_roster_cache(
+    make_get_request,
+    make_post_request,
+    execute_sql,
+    setup_database,
+    create_couriers,
+):
+    await setup_database
+    await create_couriers
+    await make_post_request("/orders/assign")
+    await execute_sql(
+        "TRUNCATE TABLE couriers RESTART IDENTITY CASCADE",
+        "INSERT INTO couriers (courier_type, regions, working_hours) "
+        "VALUES ('BIKE', '{5}', '{08:00-09:00}')",
+    )
+    response = await make_get_request("/couriers/1")
+    assert response.status == HTTPStatus.OK
+    assert response.body["courier_type"] == "BIKE"
+
+
+async def test_pool_stats(make_get_request, setup_database, create_couriers):
+    await setup_database
+    await create_couriers
+    stats = await make_get_request("/stats/pool")
+    await make_get_request("/couriers")
+    response = await make_get_request("/stats/pool")
+    assert response.status == HTTPStatus.OK
+    assert response.body["checkouts"] > stats.body["checkouts"]
+    assert 0 <= response.body["utilization"] <= 1
+
+
 async def test_get_non_existing_courier(
     make_get_request, setup_database, create_couriers
 ):
@@ -172,6 +234,35 @@ async def test_get_couriers_offset(
     }
 
 
+async def test_get_couriers_cursor(
+    make_get_request, setup_database, create_couriers
+):
+    await setup_database
+    await create_couriers
+    response = await make_get_request("/couriers?limit=1&cursor=")
+    assert response.status == HTTPStatus.OK
+    assert [
+        courier["courier_id"] for courier in response.body["couriers"]
+    ] == [1]
+    assert response.body["next_cursor"] is not None
+
+    offset_response = await make_get_request("/couriers?limit=1&offset=1")
+    response = await make_get_request(
+        f"/couriers?limit=1&cursor={response.body['next_cursor']}"
+    )
+    assert response.status == HTTPStatus.OK
+    assert response.body["couriers"] == offset_response.body["couriers"]
+
+
+async def test_get_couriers_invalid_cursor(
+    make_get_request, setup_database, create_couriers
+):
+    await setup_database
+    await create_couriers
+    response = await make_get_request("/couriers?cursor=invalid")
+    assert response.status == HTTPStatus.BAD_REQUEST
+
+
 async def test_get_couriers_limit_offset(
     make_get_request, setup_database, create_couriers
 ):
@@ -500,3 +591,175 @@ async def test_get_couriers_assignments_invalid_data(
         f"/couriers/assignments?date={date}&courier_id={courier_id}"
     )
     assert response.status == expected_status
+
+
+async def test_post_couriers_meta_info(
+    make_post_request,
+    make_get_request,
+    setup_database,
+    create_couriers,
+    create_orders,
+    complete_orders,
+):
+    await setup_database
+    await create_couriers
+    await create_orders
+    await complete_orders
+    response = await make_post_request(
+        "/couriers/meta-info",
+        params={
+            "courier_ids": "all",
+            "start_date": "2023-04-01",
+            "end_date": "2023-05-02",
+        },
+    )
+    assert response.status == HTTPStatus.OK
+    assert [meta_info["courier_id"] for meta_info in response.body] == [
+        1,
+        2,
+        3,
+    ]
+    single = await make_get_request(
+        "/couriers/meta-info/1?start_date=2023-04-01&end_date=2023-05-02"
+    )
+    assert response.body[0] == single.body
+    assert response.body[1]["earnings"] is None
+
+    response = await make_post_request(
+        "/couriers/meta-info",
+        params={
+            "courier_ids": [3, 1, 999],
+            "start_date": "2023-04-01",
+            "end_date": "2023-05-02",
+        },
+    )
+    assert response.status == HTTPStatus.OK
+    assert [meta_info["courier_id"] for meta_info in response.body] == [1, 3]
+
+
+async def test_post_couriers_meta_info_invalid_data(make_post_request):
+    response = await make_post_request(
+        "/couriers/meta-info",
+        params={"courier_ids": "some", "start_date": "2023-04-01"},
+    )
+    assert response.status == HTTPStatus.BAD_REQUEST
+
+
+async def complete(make_post_request, *complete_info):
+    response = await make_post_request(
+        "/orders/complete",
+        params={
+            "complete_info": [
+                {
+                    "courier_id": courier_id,
+                    "order_id": order_id,
+                    "complete_time": complete_time,
+                }
+                for courier_id, order_id, complete_time in complete_info
+            ]
+        },
+    )
+    assert response.status == HTTPStatus.OK
+
+
+async def test_earnings_of_one_day_add_up(
+    make_post_request,
+    make_get_request,
+    setup_database,
+    create_couriers,
+    create_orders,
+):
+    await setup_database
+    await create_couriers
+    await create_orders
+    await complete(make_post_request, (1, 1, "2023-05-01T10:00:00"))
+    await complete(make_post_request, (1, 3, "2023-05-01T15:00:00"))
+    response = await make_get_request(
+        "/couriers/meta-info/1?start_date=2023-05-01&end_date=2023-05-02"
+    )
+    assert response.body["earnings"] == 2 * (150 + 100)
+
+
+async def test_repeated_completion_is_counted_once(
+    make_post_request,
+    make_get_request,
+    execute_sql,
+    setup_database,
+    create_couriers,
+    create_orders,
+):
+    await setup_database
+    await create_couriers
+    await create_orders
+    await complete(make_post_request, (1, 1, "2023-05-01T12:00:00"))
+    await complete(
+        make_post_request,
+        (1, 1, "2023-05-01T12:00:00"),
+        (1, 3, "2023-05-01T15:00:00"),
+    )
+    response = await make_get_request(
+        "/couriers/meta-info/1?start_date=2023-05-01&end_date=2023-05-02"
+    )
+    assert response.body["earnings"] == 2 * (150 + 100)
+    assert await execute_sql(
+        "SELECT cost_sum, order_count FROM courier_daily_earnings"
+    ) == [[(250, 2)]]
+
+
+async def test_earnings_between_non_midnight_bounds(
+    make_post_request,
+    postgres_repository,
+    setup_database,
+    create_couriers,
+    create_orders,
+):
+    await setup_database
+    await create_couriers
+    await create_orders
+    await complete(
+        make_post_request,
+        (1, 1, "2023-05-01T10:00:00"),
+        (1, 3, "2023-05-01T15:00:00"),
+    )
+    assert await postgres_repository.get_cost_sum_and_order_count(
+        courier_id=1,
+        start_date=datetime(2023, 5, 1, 9),
+        end_date=datetime(2023, 5, 1, 12),
+    ) == (150, 1)
+    assert await postgres_repository.get_cost_sum_and_order_count(
+        courier_id=1,
+        start_date=datetime(2023, 5, 1, 12),
+        end_date=datetime(2023, 5, 2),
+    ) == (100, 1)
+
+
+async def test_backfill_matches_raw_aggregate(
+    make_post_request,
+    postgres_repository,
+    execute_sql,
+    setup_database,
+    create_couriers,
+    create_orders,
+):
+    await setup_database
+    await create_couriers
+    await create_orders
+    await complete(
+        make_post_request,
+        (1, 1, "2023-05-01T10:00:00"),
+        (1, 3, "2023-05-01T15:00:00"),
+        (1, 2, "2023-05-03T10:00:00"),
+    )
+    await execute_sql("DELETE FROM courier_daily_earnings")
+
+    assert await postgres_repository.rebuild_earnings_rollup() == 2
+    rollup, raw_aggregate = await execute_sql(
+        "SELECT courier_id, day, cost_sum, order_count "
+        "FROM courier_daily_earnings ORDER BY courier_id, day",
+        "SELECT courier_id, date(completed_time), sum(cost), count(id) "
+        "FROM orders WHERE completed_time IS NOT NULL "
+        "GROUP BY courier_id, date(completed_time) "
+        "ORDER BY courier_id, date(completed_time)",
+    )
+    assert rollup == raw_aggregate
+    assert len(rollup) == 2
@@ -1,7 +1,9 @@
+import asyncio
 from datetime import datetime
 from http import HTTPStatus
 
 import pytest
+from pytest import approx
 
 pytestmark = pytest.mark.asyncio
 
@@ -82,6 +84,33 @@ async def test_post_orders_invalid(params, make_post_request):
     assert response.status == HTTPStatus.BAD_REQUEST
 
 
+async def test_post_orders_bulk(
+    make_post_request, make_get_request, setup_database
+):
+    await setup_database
+    orders = [
+        {
+            "weight": 1 + index % 10,
+            "regions": 1 + index % 5,
+            "delivery_hours": ["09:00-12:00"],
+            "cost": 100 + index,
+        }
+        for index in range(1000)
+    ]
+    response = await make_post_request("/orders", params={"orders": orders})
+    assert response.status == HTTPStatus.OK
+    assert len(response.body) == len(orders)
+    order_ids = [order["order_id"] for order in response.body]
+    assert order_ids == sorted(set(order_ids))
+    assert [order["cost"] for order in response.body] == [
+        order["cost"] for order in orders
+    ]
+
+    response = await make_get_request(f"/orders/{order_ids[-1]}")
+    assert response.status == HTTPStatus.OK
+    assert response.body["cost"] == orders[-1]["cost"]
+
+
 async def test_get_existing_order(make_get_request):
     response = await make_get_request("/orders/1")
     assert response.status == HTTPStatus.OK
@@ -234,6 +263,47 @@ async def test_complete_orders(make_post_request, create_couriers):
     ]
 
 
+async def test_complete_orders_bulk(
+    make_post_request, make_get_request, setup_database, create_couriers
+):
+    await setup_database
+    await create_couriers
+    # Enough rows to exceed the 32767 bind parameters of one statement
+    # if every completion were bound value by value.
+    orders = [
+        {
+            "weight": 1,
+            "regions": 1,
+            "delivery_hours": ["09:00-12:00"],
+            "cost": 1 + index % 7,
+        }
+        for index in range(12000)
+    ]
+    response = await make_post_request("/orders", params={"orders": orders})
+    assert response.status == HTTPStatus.OK
+    complete_info = [
+        {
+            "courier_id": 1,
+            "order_id": order["order_id"],
+            "complete_time": f"2023-05-0{1 + index % 3}T12:00:00.000Z",
+        }
+        for index, order in enumerate(response.body)
+    ]
+    response = await make_post_request(
+        "/orders/complete", params={"complete_info": complete_info}
+    )
+    assert response.status == HTTPStatus.OK
+    assert len(response.body) == len(complete_info)
+
+    response = await make_get_request(
+        "/couriers/meta-info/1?start_date=2023-05-01&end_date=2023-05-04"
+    )
+    assert response.status == HTTPStatus.OK
+    assert response.body["earnings"] == 2 * sum(
+        order["cost"] for order in orders
+    )
+
+
 async def test_invalid_complete_orders(make_post_request):
     response = await make_post_request(
         "/orders/complete",
@@ -418,3 +488,318 @@ async def test_double_assign_orders(
     await assign_orders
     response = await make_post_request("/orders/assign")
     assert response.status == 400
+
+
+async def test_incremental_assign_orders(
+    make_post_request,
+    setup_database,
+    create_couriers,
+    create_orders,
+    assign_orders,
+):
+    await setup_database
+    await create_couriers
+    await create_orders
+    await assign_orders
+    response = await make_post_request("/orders/assign?incremental=true")
+    assert response.status == HTTPStatus.CREATED
+    assert response.body == {
+        "date": datetime.now().strftime("%Y-%m-%d"),
+        "couriers": [],
+    }
+
+
+async def test_incremental_assign_orders_round_trip(
+    make_post_request,
+    execute_sql,
+    postgres_repository,
+    setup_database,
+    create_couriers,
+    create_orders,
+):
+    await setup_database
+    await create_couriers
+    await create_orders
+    from models import TimeSlot
+
+    date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    await postgres_repository.save_schedule(
+        time_slots={
+            1: [TimeSlot(start_minute=600, order_ids=[1], weight=1.5, cost=1)]
+        },
+        date=date,
+    )
+    await make_post_request(
+        "/orders",
+        params={
+            "orders": [
+                {
+                    "weight": 1,
+                    "regions": 1,
+                    "delivery_hours": ["10:00-14:00"],
+                    "cost": 100,
+                }
+            ]
+        },
+    )
+    response = await make_post_request("/orders/assign?incremental=true")
+    assert response.status == HTTPStatus.CREATED
+
+    (rows,) = await execute_sql(
+        "SELECT courier_id, order_id, group_order_id, lead_order_id, "
+        "to_char(group_time, 'HH24:MI'), group_weight "
+        "FROM orders_delivery_schedule ORDER BY group_time, group_order_id"
+    )
+    assert [tuple(row[:-1]) for row in rows] == [
+        (1, 1, 0, 1, "10:00"),
+        (1, 4, 1, 1, "10:00"),
+        (1, 3, 0, 3, "10:35"),
+    ]
+    assert [row[-1] for row in rows] == approx([2.5, 2.5, 0.8])
+
+
+async def test_concurrent_incremental_assign_orders(
+    make_post_request,
+    execute_sql,
+    setup_database,
+    create_couriers,
+    create_orders,
+    assign_orders,
+):
+    await setup_database
+    await create_couriers
+    await create_orders
+    await assign_orders
+    await make_post_request(
+        "/orders",
+        params={
+            "orders": [
+                {
+                    "weight": 1,
+                    "regions": 1,
+                    "delivery_hours": ["10:00-14:00"],
+                    "cost": 100,
+                }
+                for _ in range(2)
+            ]
+        },
+    )
+    responses = await asyncio.gather(
+        make_post_request("/orders/assign?incremental=true"),
+        make_post_request("/orders/assign?incremental=true"),
+    )
+    assert all(response.status == HTTPStatus.CREATED for response in responses)
+    (duplicates,) = await execute_sql(
+        "SELECT order_id FROM orders_delivery_schedule "
+        "GROUP BY date, order_id HAVING count(*) > 1"
+    )
+    assert duplicates == []
+
+
+async def test_assign_orders_stream(
+    make_post_request, setup_database, create_couriers, create_orders
+):
+    await setup_database
+    await create_couriers
+    await create_orders
+    response = await make_post_request("/orders/assign/stream")
+    assert response.status == HTTPStatus.CREATED
+    assert response.body == {
+        "date": datetime.now().strftime("%Y-%m-%d"),
+        "orders_count": 3,
+        "assigned_count": 2,
+        "couriers_count": 1,
+        "planned": True,
+    }
+
+
+async def test_replan_orders(
+    make_post_request,
+    make_get_request,
+    setup_database,
+    create_couriers,
+    create_orders,
+    assign_orders,
+):
+    await setup_database
+    await create_couriers
+    await create_orders
+    await assign_orders
+    response = await make_post_request("/orders/assign/replan")
+    assert response.status == HTTPStatus.CREATED
+    assignments = await make_get_request("/couriers/assignments")
+    assert assignments.body == response.body
+
+
+async def test_replan_orders_keeps_completed_orders(
+    make_post_request,
+    setup_database,
+    create_couriers,
+    create_orders,
+    assign_orders,
+):
+    await setup_database
+    await create_couriers
+    await create_orders
+    await assign_orders
+    await make_post_request(
+        "/orders/complete",
+        params={
+            "complete_info": [
+                {
+                    "courier_id": 1,
+                    "order_id": 1,
+                    "complete_time": datetime.now().isoformat(),
+                }
+            ]
+        },
+    )
+    response = await make_post_request("/orders/assign/replan")
+    assert response.status == HTTPStatus.CREATED
+    assert sorted(
+        order["id"]
+        for courier in response.body["couriers"]
+        for group in courier["orders"]
+        for order in group["orders"]
+    ) == [1, 3]
+
+
+async def test_replan_orders_leaves_completed_slots_alone(
+    make_post_request,
+    execute_sql,
+    setup_database,
+    create_couriers,
+    create_orders,
+    assign_orders,
+):
+    await setup_database
+    await create_couriers
+    await create_orders
+    await assign_orders
+    await make_post_request(
+        "/orders/complete",
+        params={
+            "complete_info": [
+                {
+                    "courier_id": 1,
+                    "order_id": 1,
+                    "complete_time": datetime.now().isoformat(),
+                }
+            ]
+        },
+    )
+    await make_post_request(
+        "/orders",
+        params={
+            "orders": [
+                {
+                    "weight": 1,
+                    "regions": 1,
+                    "delivery_hours": ["10:00-11:00"],
+                    "cost": 100,
+                }
+            ]
+        },
+    )
+    response = await make_post_request("/orders/assign/replan")
+    assert response.status == HTTPStatus.CREATED
+
+    (slots,) = await execute_sql(
+        "SELECT count(*), count(DISTINCT schedule.group_order_id), "
+        "sum(orders.weight) "
+        "FROM orders_delivery_schedule AS schedule "
+        "JOIN orders ON orders.id = schedule.order_id "
+        "GROUP BY schedule.courier_id, schedule.group_time"
+    )
+    assert sum(orders_count for orders_count, _, _ in slots) == 3
+    for orders_count, group_order_ids_count, weight in slots:
+        assert orders_count == group_order_ids_count
+        assert orders_count <= 2
+        assert weight <= 10
+
+
+async def test_replan_orders_invalid_date(make_post_request):
+    response = await make_post_request("/orders/assign/replan?date=e")
+    assert response.status == HTTPStatus.BAD_REQUEST
+
+
+async def test_assign_orders_batch(
+    make_post_request, setup_database, create_couriers, create_orders
+):
+    await setup_database
+    await create_couriers
+    await create_orders
+    current_date = datetime.now().strftime("%Y-%m-%d")
+    response = await make_post_request(
+        f"/orders/assign/batch?start_date={current_date}"
+        f"&end_date={current_date}"
+    )
+    assert response.status == HTTPStatus.CREATED
+    assert response.body == [
+        {
+            "date": current_date,
+            "orders_count": 3,
+            "assigned_count": 2,
+            "couriers_count": 1,
+            "planned": True,
+        }
+    ]
+
+
+async def test_assign_orders_batch_skips_planned_dates(
+    make_post_request,
+    setup_database,
+    create_couriers,
+    create_orders,
+    assign_orders,
+):
+    await setup_database
+    await create_couriers
+    await create_orders
+    await assign_orders
+    current_date = datetime.now().strftime("%Y-%m-%d")
+    response = await make_post_request(
+        f"/orders/assign/batch?start_date={current_date}"
+        f"&end_date={current_date}"
+    )
+    assert response.status == HTTPStatus.CREATED
+    assert response.body[0]["planned"] is False
+
+
+@pytest.mark.parametrize(
+    "start_date,end_date",
+    [
+        ("e", "2023-05-01"),
+        ("2023-05-02", "2023-05-01"),
+        ("2023-01-01", "2023-05-01"),
+    ],
+)
+async def test_assign_orders_batch_invalid_range(
+    start_date, end_date, make_post_request
+):
+    response = await make_post_request(
+        f"/orders/assign/batch?start_date={start_date}&end_date={end_date}"
+    )
+    assert response.status == HTTPStatus.BAD_REQUEST
+
+
+async def test_scheduled_slots_with_same_start_are_kept_apart(
+    postgres_repository, setup_database, create_couriers, create_orders
+):
+    await setup_database
+    await create_couriers
+    await create_orders
+    from models import TimeSlot
+
+    date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    time_slots = {
+        1: [
+            TimeSlot(start_minute=600, order_ids=[1, 3], weight=2.3, cost=1),
+            TimeSlot(start_minute=600, order_ids=[2], weight=3.2, cost=2),
+        ]
+    }
+    await postgres_repository.save_schedule(time_slots=time_slots, date=date)
+
+    assert await postgres_repository.get_scheduled_slots(date=date) == {
+        1: sorted(time_slots[1], key=lambda time_slot: time_slot.order_ids)
+    }
@@ -0,0 +1,27 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "app"))
+os.environ.setdefault("PROJECT_NAME", "lavka")
+os.environ.setdefault(
+    "STORAGE_URL", "postgresql+asyncpg://postgres:password@db/postgres"
+)
+
+
+# Unit tests run in-process, so the HTTP/database fixtures are disabled.
+@pytest.fixture(autouse=True)
+def setup_database():
+    pass
+
+
+@pytest.fixture(autouse=True)
+def create_couriers():
+    pass
+
+
+@pytest.fixture(autouse=True)
+def create_orders():
+    pass
@@ -0,0 +1,259 @@
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import pytest
+
+from core.constants import COURIER_SETTINGS
+from models import CourierModel, CourierType, OrderModel, TimeSlot
+from services.assignment.base import get_slot_template
+from services.assignment.cost_optimal import CostOptimalEngine
+from services.assignment.greedy import GreedyEngine
+from services.assignment.problem import AssignmentProblem, solve
+from services.assignment.sharding import split_problem
+from tests.unit.test_slot_index import in_intervals
+
+
+def minutes_to_time(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def random_hours(rnd):
+    hours = []
+    for _ in range(rnd.randint(1, 3)):
+        start = rnd.randint(0, 22 * 60)
+        end = min(start + rnd.randint(30, 10 * 60), 24 * 60)
+        hours.append(f"{minutes_to_time(start)}-{minutes_to_time(end)}")
+    return hours
+
+
+def random_day(seed, couriers_count, orders_count, regions_count):
+    rnd = random.Random(seed)
+    couriers = [
+        CourierModel(
+            courier_id=courier_id,
+            courier_type=rnd.choice(list(CourierType)),
+            regions=rnd.sample(range(1, regions_count + 1), rnd.randint(1, 4)),
+            working_hours=random_hours(rnd),
+        )
+        for courier_id in range(1, couriers_count + 1)
+    ]
+    orders = [
+        OrderModel(
+            order_id=order_id,
+            weight=round(rnd.uniform(0.1, 45), 2),
+            regions=rnd.randint(1, regions_count),
+            delivery_hours=random_hours(rnd),
+            cost=rnd.randint(50, 500),
+        )
+        for order_id in range(1, orders_count + 1)
+    ]
+    return couriers, orders
+
+
+def get_totals(couriers, orders, time_slots):
+    couriers = {courier.id: courier for courier in couriers}
+    orders = {order.id: order for order in orders}
+    assigned, total_cost = [], 0
+    for courier_id, courier_slots in time_slots.items():
+        courier = couriers[courier_id]
+        settings = COURIER_SETTINGS[courier.courier_type]
+        assert sum(len(slot.order_ids) for slot in courier_slots) <= len(
+            courier_slots
+        )
+        for time_slot in courier_slots:
+            order_ids = time_slot.order_ids
+            assert len(order_ids) <= settings["max_orders"]
+            assert time_slot.weight == pytest.approx(
+                sum(orders[order_id].weight for order_id in order_ids)
+            )
+            assert time_slot.weight <= settings["max_weight"] + 1e-9
+            for order_id in order_ids:
+                order = orders[order_id]
+                assert (
+                    order.regions in courier.regions[: settings["max_regions"]]
+                )
+                assert in_intervals(
+                    time_slot.start_minute % (24 * 60),
+                    order.delivery_intervals,
+                )
+            assigned.extend(order_ids)
+            total_cost += time_slot.cost
+    assert len(assigned) == len(set(assigned))
+    return len(assigned), total_cost
+
+
+@pytest.mark.parametrize(
+    "seed,couriers_count,orders_count,regions_count",
+    [(4, 5, 60, 4), (5, 40, 1500, 5), (6, 150, 5000, 30)],
+)
+def test_cost_optimal_engine_improves_greedy(
+    seed, couriers_count, orders_count, regions_count
+):
+    couriers, orders = random_day(
+        seed, couriers_count, orders_count, regions_count
+    )
+    date = datetime(2023, 5, 1)
+
+    greedy_count, greedy_cost = get_totals(
+        couriers,
+        orders,
+        GreedyEngine().assign(couriers=couriers, orders=orders, date=date),
+    )
+    count, cost = get_totals(
+        couriers,
+        orders,
+        CostOptimalEngine(time_budget=5).assign(
+            couriers=couriers, orders=orders, date=date
+        ),
+    )
+
+    assert count > greedy_count or (
+        count == greedy_count and cost <= greedy_cost
+    )
+
+
+def test_problem_solved_in_process_pool_matches_inline():
+    couriers, orders = random_day(7, 30, 500, 5)
+    problem = AssignmentProblem.from_models(
+        couriers=couriers, orders=orders, date=datetime(2023, 5, 1)
+    )
+
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        actual = executor.submit(solve, GreedyEngine(), problem).result()
+
+    assert actual == solve(GreedyEngine(), problem)
+
+
+@pytest.mark.parametrize("shards_count", [1, 3, 8])
+def test_sharded_problem_matches_whole_day(shards_count):
+    couriers, orders = [], []
+    for city in range(6):
+        city_couriers, city_orders = random_day(8 + city, 40, 1000, 6)
+        for courier in city_couriers:
+            courier.id += city * 1000
+            courier.regions = [
+                region + city * 10 for region in courier.regions
+            ]
+            couriers.append(courier)
+        for order in city_orders:
+            order.id += city * 1000
+            order.regions += city * 10
+            orders.append(order)
+    problem = AssignmentProblem.from_models(
+        couriers=couriers, orders=orders, date=datetime(2023, 5, 1)
+    )
+    shards = split_problem(problem, shards_count=shards_count)
+
+    time_slots = {}
+    for shard in shards:
+        time_slots.update(solve(GreedyEngine(), shard))
+
+    assert len(shards) == min(shards_count, 6)
+    assert get_assigned(time_slots) == get_assigned(
+        solve(GreedyEngine(), problem)
+    )
+
+
+def get_assigned(time_slots):
+    return {
+        courier_id: courier_slots
+        for courier_id, courier_slots in time_slots.items()
+        if any(time_slot.order_ids for time_slot in courier_slots)
+    }
+
+
+@pytest.mark.parametrize("seed", [9, 10, 11])
+def test_incremental_assignment_keeps_scheduled_orders(seed):
+    couriers, orders = random_day(seed, 40, 1500, 5)
+    date = datetime(2023, 5, 1)
+    planned_orders, late_orders = orders[:900], orders[900:]
+    planned = GreedyEngine().assign(
+        couriers=couriers, orders=planned_orders, date=date
+    )
+    scheduled_slots = {
+        courier_id: [
+            TimeSlot(
+                start_minute=time_slot.start_minute,
+                order_ids=list(time_slot.order_ids),
+                weight=time_slot.weight,
+                cost=time_slot.cost,
+            )
+            for time_slot in courier_slots
+            if time_slot.order_ids
+        ]
+        for courier_id, courier_slots in planned.items()
+    }
+
+    time_slots = GreedyEngine().assign(
+        couriers=couriers,
+        orders=late_orders,
+        date=date,
+        scheduled_slots=scheduled_slots,
+    )
+
+    for courier_id, courier_slots in planned.items():
+        for planned_slot, time_slot in zip(
+            courier_slots, time_slots[courier_id]
+        ):
+            planned_count = len(planned_slot.order_ids)
+            assert (
+                time_slot.order_ids[:planned_count] == planned_slot.order_ids
+            )
+    count, _ = get_totals(couriers, orders, time_slots)
+    assert count > get_totals(couriers, orders, planned)[0]
+
+
+def test_couriers_with_same_signature_share_slot_template():
+    couriers, _ = random_day(12, 200, 0, 4)
+    for courier in couriers[100:]:
+        courier.courier_type = couriers[0].courier_type
+        courier.working_hours = couriers[0].working_hours
+    get_slot_template.cache_clear()
+
+    time_slots, available_slots = GreedyEngine().get_time_slots(
+        couriers=couriers, date=datetime(2023, 5, 1)
+    )
+
+    assert get_slot_template.cache_info().hits >= 99
+    assert time_slots[couriers[-1].id] == time_slots[couriers[0].id]
+    assert time_slots[couriers[-1].id] is not time_slots[couriers[0].id]
+    assert available_slots == {
+        courier_id: len(courier_slots)
+        for courier_id, courier_slots in time_slots.items()
+    }
+
+
+@pytest.mark.parametrize("engine", [GreedyEngine(), CostOptimalEngine()])
+def test_taken_slots_are_left_out(engine):
+    couriers, orders = random_day(14, 20, 600, 4)
+    date = datetime(2023, 5, 1)
+    all_slots, _ = GreedyEngine().get_time_slots(couriers=couriers, date=date)
+    taken_slots = {
+        courier_id: [
+            time_slot.start_minute for time_slot in courier_slots[::2]
+        ]
+        for courier_id, courier_slots in all_slots.items()
+    }
+    problem = AssignmentProblem.from_models(
+        couriers=couriers, orders=orders, date=date, taken_slots=taken_slots
+    )
+
+    time_slots = solve(engine, problem)
+
+    for courier_id, courier_slots in all_slots.items():
+        assert Counter(
+            time_slot.start_minute for time_slot in time_slots[courier_id]
+        ) + Counter(taken_slots[courier_id]) == Counter(
+            time_slot.start_minute for time_slot in courier_slots
+        )
+    assert get_assigned(
+        {
+            courier_id: courier_slots
+            for shard in split_problem(problem, shards_count=3)
+            for courier_id, courier_slots in solve(
+                GreedyEngine(), shard
+            ).items()
+        }
+    ) == get_assigned(solve(GreedyEngine(), problem))
@@ -0,0 +1,342 @@
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+
+from infrastructure.memory_repository import LavkaMemoryRepository
+from models import CompleteOrderList, CouriersList, OrdersList, TimeSlot
+from services.use_cases.courier_service import CourierService
+from services.use_cases.order_service import OrderService
+from tests.unit.test_assignment_engines import random_day
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest_asyncio.fixture
+async def repository():
+    repository = LavkaMemoryRepository()
+    await repository.create_couriers(
+        couriers_model=CouriersList.parse_obj(
+            {
+                "couriers": [
+                    {
+                        "courier_type": "FOOT",
+                        "regions": [1, 2, 9],
+                        "working_hours": ["10:00-14:00", "16:00-20:00"],
+                    },
+                    {
+                        "courier_type": "BIKE",
+                        "regions": [4, 5, 6],
+                        "working_hours": ["09:00-13:00", "15:00-19:00"],
+                    },
+                ]
+            }
+        )
+    )
+    await repository.create_orders(
+        orders_model=OrdersList.parse_obj(
+            {
+                "orders": [
+                    {
+                        "weight": 1.5,
+                        "regions": 1,
+                        "delivery_hours": ["09:00-12:00"],
+                        "cost": 150,
+                    },
+                    {
+                        "weight": 3.2,
+                        "regions": 2,
+                        "delivery_hours": ["14:00-18:00", "19:00-22:00"],
+                        "cost": 250,
+                    },
+                    {
+                        "weight": 0.8,
+                        "regions": 5,
+                        "delivery_hours": ["10:00-11:00"],
+                        "cost": 100,
+                    },
+                ]
+            }
+        )
+    )
+    return repository
+
+
+async def test_simulated_day(repository):
+    order_service = OrderService(repository=repository)
+    courier_service = CourierService(repository=repository)
+    date = datetime.now()
+
+    schedule = await order_service.assign_orders(date=date)
+
+    assert await order_service.assign_orders(date=date) is None
+    assert schedule == await courier_service.get_couriers_assignments(
+        courier_id=-1, date=date
+    )
+    assert {
+        courier.courier_id: [
+            order.id for group in courier.orders for order in group.orders
+        ]
+        for courier in schedule.couriers
+    } == {1: [1], 2: [3]}
+
+    completed = await order_service.complete_orders(
+        CompleteOrderList.parse_obj(
+            {
+                "complete_info": [
+                    {
+                        "courier_id": 1,
+                        "order_id": 1,
+                        "complete_time": "2023-05-01T12:00:00",
+                    }
+                ]
+            }
+        )
+    )
+    meta_info = await courier_service.get_courier_meta_info(
+        courier_id=1,
+        start_date=datetime(2023, 5, 1),
+        end_date=datetime(2023, 5, 2),
+    )
+
+    assert [order.id for order in completed] == [1]
+    assert meta_info.earnings == 300
+    assert meta_info.rating == pytest.approx(1 / 10 * 3)
+
+
+async def test_batch_meta_info_matches_single_requests(repository):
+    courier_service = CourierService(repository=repository)
+    await repository.complete_orders(
+        complete_orders_model=CompleteOrderList.parse_obj(
+            {
+                "complete_info": [
+                    {
+                        "courier_id": 1,
+                        "order_id": 1,
+                        "complete_time": "2023-05-01T12:00:00",
+                    },
+                    {
+                        "courier_id": 2,
+                        "order_id": 3,
+                        "complete_time": "2023-05-02T12:00:00",
+                    },
+                ]
+            }
+        )
+    )
+    date_range = {
+        "start_date": datetime(2023, 5, 1),
+        "end_date": datetime(2023, 5, 3),
+    }
+
+    meta_infos = [
+        meta_info
+        async for meta_info in courier_service.get_couriers_meta_info(
+            courier_ids=None, **date_range
+        )
+    ]
+
+    assert meta_infos == [
+        await courier_service.get_courier_meta_info(
+            courier_id=courier_id, **date_range
+        )
+        for courier_id in (1, 2)
+    ]
+    assert meta_infos[1].earnings == 300
+    assert [
+        meta_info
+        async for meta_info in courier_service.get_couriers_meta_info(
+            courier_ids=[2, 2, 99], **date_range
+        )
+    ] == meta_infos[1:]
+
+
+async def test_rejected_completion_changes_nothing(repository):
+    complete_info = [
+        {"courier_id": 1, "order_id": 1, "complete_time": "2023-05-01T12:00"},
+        {"courier_id": 2, "order_id": 1, "complete_time": "2023-05-01T12:00"},
+    ]
+
+    assert (
+        await repository.complete_orders(
+            complete_orders_model=CompleteOrderList.parse_obj(
+                {"complete_info": complete_info}
+            )
+        )
+        is None
+    )
+    assert (await repository.get_order(order_id=1)).completed_time is None
+
+    completed = await repository.complete_orders(
+        complete_orders_model=CompleteOrderList.parse_obj(
+            {"complete_info": complete_info[:1] * 2}
+        )
+    )
+    assert [order.id for order in completed] == [1]
+    assert completed[0].completed_time == datetime(2023, 5, 1, 12)
+
+
+async def test_late_order_is_added_to_schedule(repository):
+    order_service = OrderService(repository=repository)
+    date = datetime.now()
+    await order_service.assign_orders(date=date)
+    await repository.create_orders(
+        orders_model=OrdersList.parse_obj(
+            {
+                "orders": [
+                    {
+                        "weight": 1,
+                        "regions": 4,
+                        "delivery_hours": ["10:00-11:00"],
+                        "cost": 100,
+                    }
+                ]
+            }
+        )
+    )
+
+    late_schedule = await order_service.assign_orders(
+        date=date, incremental=True
+    )
+
+    assert [
+        order.id
+        for courier in late_schedule.couriers
+        for group in courier.orders
+        for order in group.orders
+    ] == [4]
+    assert await repository.get_count_of_schedule(date=date) == 3
+
+
+async def test_slots_with_same_start_are_kept_apart(repository):
+    date = datetime(2023, 5, 1)
+    time_slots = {
+        1: [
+            TimeSlot(start_minute=600, order_ids=[2, 1], weight=4.7, cost=1),
+            TimeSlot(start_minute=600, order_ids=[3], weight=0.8, cost=2),
+        ]
+    }
+    await repository.save_schedule(time_slots=time_slots, date=date)
+
+    assert await repository.get_scheduled_slots(date=date) == time_slots
+
+
+async def test_replan_keeps_completed_orders(repository):
+    order_service = OrderService(repository=repository)
+    date = datetime.now()
+    await order_service.assign_orders(date=date)
+    await repository.complete_orders(
+        complete_orders_model=CompleteOrderList.parse_obj(
+            {
+                "complete_info": [
+                    {
+                        "courier_id": 1,
+                        "order_id": 1,
+                        "complete_time": date.isoformat(),
+                    }
+                ]
+            }
+        )
+    )
+
+    schedule = await order_service.replan_orders(date=date)
+
+    assert {
+        courier.courier_id: [
+            order.id for group in courier.orders for order in group.orders
+        ]
+        for courier in schedule.couriers
+    } == {1: [1], 2: [3]}
+    assert await repository.get_count_of_schedule(date=date) == 2
+
+
+async def test_replan_does_not_reuse_completed_slots(repository):
+    order_service = OrderService(repository=repository)
+    date = datetime.now()
+    await order_service.assign_orders(date=date)
+    await repository.complete_orders(
+        complete_orders_model=CompleteOrderList.parse_obj(
+            {
+                "complete_info": [
+                    {
+                        "courier_id": 1,
+                        "order_id": 1,
+                        "complete_time": date.isoformat(),
+                    }
+                ]
+            }
+        )
+    )
+    await repository.create_orders(
+        orders_model=OrdersList.parse_obj(
+            {
+                "orders": [
+                    {
+                        "weight": 1,
+                        "regions": 1,
+                        "delivery_hours": ["10:00-11:00"],
+                        "cost": 100,
+                    }
+                ]
+            }
+        )
+    )
+    (completed_slot,) = (
+        await repository.get_scheduled_slots(date=date, completed_only=True)
+    )[1]
+
+    await order_service.replan_orders(date=date)
+
+    courier_slots = (await repository.get_scheduled_slots(date=date))[1]
+    assert completed_slot in courier_slots
+    assert [time_slot.order_ids for time_slot in courier_slots] == [[1], [4]]
+    assert len({time_slot.start_minute for time_slot in courier_slots}) == 2
+
+
+async def test_streamed_assignment_matches_assign_orders():
+    couriers, orders = random_day(13, 30, 800, 4)
+    repositories = []
+    for _ in range(2):
+        repository = LavkaMemoryRepository()
+        await repository.create_couriers(
+            couriers_model=CouriersList(couriers=couriers)
+        )
+        await repository.create_orders(orders_model=OrdersList(orders=orders))
+        repositories.append(repository)
+    date = datetime.now()
+
+    await OrderService(repository=repositories[0]).assign_orders(date=date)
+    summary = await OrderService(
+        repository=repositories[1], assignment_stream_chunk_size=37
+    ).assign_orders_stream(date=date)
+
+    expected, actual = (
+        sorted(
+            tuple(record[key] for key in sorted(record) if key != "date")
+            for record in repository.schedule[date.date()]
+        )
+        for repository in repositories
+    )
+    assert actual == expected
+    assert summary.orders_count == len(orders)
+    assert summary.assigned_count == len(expected)
+
+
+async def test_keyset_pages_match_offset_pages():
+    _, orders = random_day(17, 7, 23, 4)
+    repository = LavkaMemoryRepository()
+    await repository.create_orders(orders_model=OrdersList(orders=orders))
+    order_service = OrderService(repository=repository)
+
+    pages, cursor = [], ""
+    while cursor is not None:
+        page = await order_service.get_orders_page(cursor=cursor, limit=5)
+        pages.append(page.orders)
+        cursor = page.next_cursor
+
+    assert [len(page) for page in pages] == [5, 5, 5, 5, 3]
+    assert [order for page in pages for order in page] == (
+        await order_service.get_orders(offset=0, limit=len(orders))
+    )
+    with pytest.raises(ValueError):
+        await order_service.get_orders_page(cursor="bm9wZQ==", limit=5)
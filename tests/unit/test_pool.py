@@ -0,0 +1,49 @@
+from sqlalchemy import create_engine
+
+from core.settings import Settings
+from infrastructure.entities import get_engine_options
+from infrastructure.pool import InstrumentedQueuePool
+
+
+def make_settings(**kwargs):
+    return Settings(
+        project_name="lavka", storage_url="postgresql+asyncpg://", **kwargs
+    )
+
+
+def test_profile_options_are_overridable():
+    options = get_engine_options(make_settings(db_profile="prod"))
+    assert options["echo"] is False
+    assert options["pool_pre_ping"] is True
+    assert options["poolclass"] is InstrumentedQueuePool
+
+    options = get_engine_options(
+        make_settings(
+            db_profile="prod", db_pool_size=3, db_statement_cache_size=0
+        )
+    )
+    assert options["pool_size"] == 3
+    assert options["connect_args"] == {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+    }
+
+
+def test_pool_reports_checkouts_and_utilization():
+    engine = create_engine(
+        "sqlite://",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=1,
+    )
+    first = engine.connect()
+    second = engine.connect()
+    stats = engine.pool.get_stats()
+    assert stats.checked_out == 2
+    assert stats.utilization == 1
+    assert stats.checkouts == 2
+    assert stats.checkout_timeouts == 0
+
+    first.close()
+    second.close()
+    assert engine.pool.get_stats().utilization == 0
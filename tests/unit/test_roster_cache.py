@@ -0,0 +1,45 @@
+from infrastructure.roster_cache import RosterCache
+from models import CourierModel
+
+
+def make_courier(courier_id, courier_type="FOOT"):
+    return CourierModel(
+        courier_id=courier_id,
+        courier_type=courier_type,
+        regions=[1],
+        working_hours=["10:00-12:00"],
+    )
+
+
+def test_roster_is_served_while_version_matches():
+    roster_cache = RosterCache()
+    couriers = [make_courier(1), make_courier(2)]
+
+    assert roster_cache.get_all(version=1) is None
+    roster_cache.set_all(couriers=couriers, version=1)
+
+    assert roster_cache.get_all(version=1) == couriers
+    assert roster_cache.get_all(version=2) is None
+    assert roster_cache.get_stats().dict() == {
+        "hits": 1,
+        "misses": 2,
+        "size": 2,
+    }
+
+
+def test_courier_is_not_served_from_stale_roster():
+    roster_cache = RosterCache()
+    roster_cache.set_all(couriers=[make_courier(1)], version=1)
+
+    assert roster_cache.get(1, version=1) == make_courier(1)
+    assert roster_cache.get(2, version=1) is None
+    # The table was truncated and refilled with the same ids.
+    assert roster_cache.get(1, version=2) is None
+
+    roster_cache.set_all(couriers=[make_courier(1, "BIKE")], version=2)
+    assert roster_cache.get(1, version=2) == make_courier(1, "BIKE")
+    assert roster_cache.get_stats().dict() == {
+        "hits": 2,
+        "misses": 2,
+        "size": 1,
+    }
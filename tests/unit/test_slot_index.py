@@ -0,0 +1,65 @@
+import random
+import pytest
+
+from models import TimeIntervals, TimeSlot
+from services.assignment.slot_index import SlotIndex
+
+
+def in_intervals(minute, intervals):
+    return any(start <= minute < end for start, end in intervals.ranges)
+
+
+def linear_timeslot_id(intervals, time_slots, max_orders, weight, max_weight):
+    return next(
+        (
+            pos
+            for pos, time_slot in enumerate(time_slots)
+            if len(time_slot.order_ids) < max_orders
+            and time_slot.weight + weight <= max_weight
+            and in_intervals(time_slot.start_minute % (24 * 60), intervals)
+        ),
+        None,
+    )
+
+
+def random_intervals(rnd):
+    ranges = []
+    for _ in range(rnd.randint(1, 3)):
+        start = rnd.randint(0, 26 * 60)
+        ranges.append((start, start + rnd.randint(-30, 12 * 60)))
+    return TimeIntervals(tuple(ranges))
+
+
+def random_time_slots(rnd, slot_time):
+    time_slots = []
+    for start, end in random_intervals(rnd).ranges:
+        for number in range(max((end - start) // slot_time + 1, 0)):
+            time_slots.append(TimeSlot(start + number * slot_time))
+    return time_slots
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_slot_index_matches_linear_first_fit(seed):
+    rnd = random.Random(seed)
+    slot_time = rnd.choice([35, 36, 32])
+    max_orders = rnd.randint(1, 7)
+    max_weight = rnd.choice([10, 20, 40])
+    time_slots = random_time_slots(rnd, slot_time)
+    slot_index = SlotIndex(
+        time_slots=time_slots,
+        slot_time=slot_time,
+        max_orders=max_orders,
+        max_weight=max_weight,
+    )
+
+    for order_id in range(300):
+        intervals = random_intervals(rnd)
+        weight = round(rnd.uniform(0.1, max_weight), 2)
+        expected = linear_timeslot_id(
+            intervals, time_slots, max_orders, weight, max_weight
+        )
+        assert slot_index.find(intervals=intervals, weight=weight) == expected
+        if expected is not None:
+            time_slots[expected].order_ids.append(order_id)
+            time_slots[expected].weight += weight
+            slot_index.update(expected)
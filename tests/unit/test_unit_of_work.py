@@ -0,0 +1,159 @@
+import json
+from contextlib import asynccontextmanager
+
+import pytest
+from dependency_injector import providers
+from fastapi import APIRouter, Depends, FastAPI
+
+from core.containers import Container
+from infrastructure.entities import engine
+from infrastructure.unit_of_work import (
+    begin,
+    get_bind,
+    release,
+    transaction,
+    UnitOfWork,
+    unit_of_work,
+)
+
+pytestmark = pytest.mark.asyncio
+
+
+class FakeConnection:
+    closed = False
+    transactions = 0
+    in_transaction_block = False
+
+    async def close(self):
+        self.closed = True
+
+    def in_transaction(self):
+        return self.in_transaction_block
+
+    @asynccontextmanager
+    async def begin(self):
+        self.transactions += 1
+        self.in_transaction_block = True
+        yield
+        self.in_transaction_block = False
+
+
+class FakeEngine:
+    def __init__(self):
+        self.connections = []
+
+    async def connect(self):
+        self.connections.append(FakeConnection())
+        return self.connections[-1]
+
+
+def make_app(storage: str, fake_engine: FakeEngine) -> FastAPI:
+    router = APIRouter(dependencies=[Depends(unit_of_work)])
+
+    def get_index(bind):
+        if bind in fake_engine.connections:
+            return fake_engine.connections.index(bind)
+        return None
+
+    @router.get("/bind")
+    async def get_request_bind():
+        bind = await get_bind()
+        return {
+            "shared": bind is await get_bind(),
+            "connection": get_index(bind),
+        }
+
+    @router.get("/idle")
+    async def get_idle():
+        return {}
+
+    @router.get("/release")
+    async def release_request_bind():
+        bind = await get_bind()
+        await release()
+        return {
+            "released": getattr(bind, "closed", False),
+            "connection": get_index(await get_bind()),
+        }
+
+    app = FastAPI()
+    app.container = Container()
+    app.container.config.storage.from_value(storage)
+    app.container.db_engine.override(providers.Object(fake_engine))
+    app.include_router(router)
+    return app
+
+
+async def get(app: FastAPI, path: str) -> dict:
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": b"",
+            "headers": [],
+            "client": ("test", 1),
+            "server": ("test", 80),
+            "scheme": "http",
+            "root_path": "",
+            "http_version": "1.1",
+        },
+        receive,
+        send,
+    )
+    return json.loads(messages[-1]["body"])
+
+
+async def test_request_shares_one_connection():
+    fake_engine = FakeEngine()
+    app = make_app("postgres", fake_engine)
+
+    assert await get(app, "/bind") == {"shared": True, "connection": 0}
+    assert await get(app, "/bind") == {"shared": True, "connection": 1}
+    assert all(connection.closed for connection in fake_engine.connections)
+    assert await get_bind() is engine
+
+
+async def test_memory_storage_does_not_connect():
+    fake_engine = FakeEngine()
+    app = make_app("memory", fake_engine)
+
+    assert await get(app, "/bind") == {"shared": True, "connection": None}
+    assert fake_engine.connections == []
+
+
+async def test_connection_is_checked_out_on_first_use():
+    fake_engine = FakeEngine()
+    app = make_app("postgres", fake_engine)
+
+    assert await get(app, "/idle") == {}
+    assert fake_engine.connections == []
+
+
+async def test_released_connection_is_checked_out_again():
+    fake_engine = FakeEngine()
+    app = make_app("postgres", fake_engine)
+
+    assert await get(app, "/release") == {"released": True, "connection": 1}
+    assert all(connection.closed for connection in fake_engine.connections)
+
+
+async def test_transaction_is_joined_by_nested_calls():
+    fake_engine = FakeEngine()
+
+    async with UnitOfWork(fake_engine):
+        async with transaction() as connection:
+            assert await get_bind() is connection
+            async with begin() as nested_connection:
+                assert nested_connection is connection
+        assert connection.transactions == 1
+    assert connection.closed